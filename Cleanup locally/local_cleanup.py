@@ -5,9 +5,18 @@ Automatically delete all images and audio files from local directories
 """
 
 import os
-from pathlib import Path
+import sys
+import threading
+import concurrent.futures
 from datetime import datetime
 
+# Deletes are I/O-bound, so run many of them at once
+DELETE_WORKERS = min(32, (os.cpu_count() or 1) * 4)
+PROGRESS_EVERY = 50
+# Per-file output is buffered and written in chunks of this many lines
+OUTPUT_FLUSH_EVERY = 500
+SIZE_UNITS = ('B', 'KB', 'MB', 'GB', 'TB')
+
 class LocalCleanup:
     def __init__(self, directories: list):
         """
@@ -16,16 +25,23 @@ class LocalCleanup:
         Args:
             directories: List of directory paths to clean
         """
-        self.directories = [Path(d) for d in directories]
+        # Plain strings keep the scan loop free of pathlib object construction
+        self.directories = [os.path.normpath(os.fspath(d)) for d in directories]
         self.total_files = 0
         self.total_size = 0
         
+        # Pool that runs unlinks in the background while deletes are queued
+        self.executor = None
+        self.progress_lock = threading.Lock()
+        self.processed_count = 0
+        self.output_buffer = []
+        
     def get_all_files(self):
         """
         Get all files from specified directories
         
         Returns:
-            dict: Dictionary with directory as key and list of files as value
+            dict: Dictionary with directory as key and list of (path, size, mtime) tuples as value
         """
         all_files = {}
         
@@ -33,24 +49,26 @@ class LocalCleanup:
         print("=" * 60)
         
         for directory in self.directories:
-            if not directory.exists():
+            if not os.path.exists(directory):
                 print(f"⚠️  Directory not found: {directory}")
                 continue
             
-            if not directory.is_dir():
+            if not os.path.isdir(directory):
                 print(f"⚠️  Not a directory: {directory}")
                 continue
             
-            # Get all files in directory
+            # Get all files in directory (scandir reuses the readdir file type/size info)
             files = []
-            for file_path in directory.iterdir():
-                if file_path.is_file():
-                    files.append(file_path)
-                    self.total_files += 1
-                    self.total_size += file_path.stat().st_size
+            with os.scandir(directory) as it:
+                for entry in it:
+                    if entry.is_file(follow_symlinks=False):
+                        stat = entry.stat(follow_symlinks=False)
+                        files.append((entry.path, stat.st_size, stat.st_mtime))
+                        self.total_files += 1
+                        self.total_size += stat.st_size
             
             all_files[directory] = files
-            print(f"📁 {directory.name}: {len(files)} file(s)")
+            print(f"📁 {os.path.basename(directory)}: {len(files)} file(s)")
         
         print("=" * 60)
         print(f"📊 Total files found: {self.total_files}")
@@ -68,18 +86,18 @@ class LocalCleanup:
         Returns:
             str: Formatted size string
         """
-        for unit in ['B', 'KB', 'MB', 'GB']:
-            if size_bytes < 1024.0:
-                return f"{size_bytes:.2f} {unit}"
-            size_bytes /= 1024.0
-        return f"{size_bytes:.2f} TB"
+        if size_bytes <= 0:
+            return "0.00 B"
+        # Each unit is 2**10 times the previous one, so bit_length picks it directly
+        unit_index = min((int(size_bytes).bit_length() - 1) // 10, len(SIZE_UNITS) - 1)
+        return f"{size_bytes / (1 << (10 * unit_index)):.2f} {SIZE_UNITS[unit_index]}"
     
     def list_files_preview(self, all_files: dict, max_preview: int = 10):
         """
         Show a preview of files that will be deleted
         
         Args:
-            all_files: Dictionary of directory to files mapping
+            all_files: Dictionary of directory to (path, size, mtime) tuples mapping
             max_preview: Maximum number of files to preview per directory
         """
         print("\n📋 Files to be deleted (preview):")
@@ -92,10 +110,9 @@ class LocalCleanup:
             print(f"\n📂 {directory}:")
             
             # Show up to max_preview files
-            for i, file_path in enumerate(files[:max_preview], 1):
-                size = file_path.stat().st_size
-                modified_time = datetime.fromtimestamp(file_path.stat().st_mtime)
-                print(f"   {i}. {file_path.name}")
+            for i, (file_path, size, mtime) in enumerate(files[:max_preview], 1):
+                modified_time = datetime.fromtimestamp(mtime)
+                print(f"   {i}. {os.path.basename(file_path)}")
                 print(f"      Size: {self.format_size(size)} | Modified: {modified_time.strftime('%Y-%m-%d %H:%M:%S')}")
             
             # Show how many more files
@@ -103,13 +120,14 @@ class LocalCleanup:
                 remaining = len(files) - max_preview
                 print(f"   ... and {remaining} more file(s)")
     
-    def delete_all_files(self, all_files: dict, dry_run: bool = False):
+    def delete_all_files(self, all_files: dict, dry_run: bool = False, verbose: bool = False):
         """
         Delete all files from directories
         
         Args:
-            all_files: Dictionary of directory to files mapping
+            all_files: Dictionary of directory to (path, size, mtime) tuples mapping
             dry_run: If True, only show what would be deleted
+            verbose: If True, print a line for every file
             
         Returns:
             tuple: (success_count, failed_count)
@@ -124,32 +142,54 @@ class LocalCleanup:
         success_count = 0
         failed_count = 0
         freed_space = 0
+        pending = []
         
-        for directory, files in all_files.items():
-            if not files:
-                continue
-            
-            print(f"\n📂 Processing: {directory.name}")
-            
-            for i, file_path in enumerate(files, 1):
-                try:
-                    file_size = file_path.stat().st_size
-                    
-                    if dry_run:
-                        print(f"   [{i}/{len(files)}] Would delete: {file_path.name} ({self.format_size(file_size)})")
-                        success_count += 1
-                        freed_space += file_size
-                    else:
-                        print(f"   [{i}/{len(files)}] Deleting: {file_path.name} ({self.format_size(file_size)})", end="")
-                        file_path.unlink()
-                        print(" ✅")
-                        success_count += 1
-                        freed_space += file_size
-                        
-                except Exception as e:
-                    print(f" ❌")
-                    print(f"      Error: {str(e)}")
-                    failed_count += 1
+        if not dry_run:
+            self.processed_count = 0
+            self.executor = concurrent.futures.ThreadPoolExecutor(max_workers=DELETE_WORKERS)
+        
+        try:
+            for directory, files in all_files.items():
+                if not files:
+                    continue
+                
+                print(f"\n📂 Processing: {os.path.basename(directory)}")
+                
+                if dry_run:
+                    dir_size = 0
+                    for i, (file_path, file_size, _) in enumerate(files, 1):
+                        if verbose:
+                            self._write_line(f"   [{i}/{len(files)}] Would delete: {os.path.basename(file_path)} ({self.format_size(file_size)})")
+                        dir_size += file_size
+                    self._flush_output()
+                    print(f"   Would delete {len(files)} file(s) ({self.format_size(dir_size)})")
+                    success_count += len(files)
+                    freed_space += dir_size
+                    continue
+                
+                # Queue deletes without waiting on each one
+                for file_path, file_size, _ in files:
+                    future = self.executor.submit(os.unlink, file_path)
+                    future.add_done_callback(self._report_progress)
+                    pending.append((future, file_path, file_size))
+        finally:
+            if self.executor is not None:
+                self.executor.shutdown(wait=True)
+                self.executor = None
+        
+        # Tally results once every delete has finished
+        for future, file_path, file_size in pending:
+            error = future.exception()
+            if error is None:
+                success_count += 1
+                freed_space += file_size
+                if verbose:
+                    self._write_line(f"   ✅ Deleted: {os.path.basename(file_path)} ({self.format_size(file_size)})")
+            else:
+                failed_count += 1
+                self._write_line(f"   ❌ {os.path.basename(file_path)}")
+                self._write_line(f"      Error: {str(error)}")
+        self._flush_output()
         
         # Print summary
         print("\n" + "=" * 60)
@@ -166,13 +206,36 @@ class LocalCleanup:
         
         return success_count, failed_count
     
-    def cleanup(self, dry_run: bool = False, show_preview: bool = True):
+    def _write_line(self, line: str):
+        """Buffer a line of output, writing it out in large chunks"""
+        self.output_buffer.append(line)
+        if len(self.output_buffer) >= OUTPUT_FLUSH_EVERY:
+            self._flush_output()
+    
+    def _flush_output(self):
+        """Write any buffered output lines to stdout"""
+        if self.output_buffer:
+            sys.stdout.write("\n".join(self.output_buffer) + "\n")
+            sys.stdout.flush()
+            self.output_buffer.clear()
+    
+    def _report_progress(self, future):
+        """Print a progress line every PROGRESS_EVERY finished deletes"""
+        with self.progress_lock:
+            self.processed_count += 1
+            if self.processed_count % PROGRESS_EVERY == 0 or self.processed_count == self.total_files:
+                print(f"   [{self.processed_count}/{self.total_files}] Processed")
+    
+    def cleanup(self, dry_run: bool = False, show_preview: bool = True, verbose: bool = False,
+                all_files: dict = None):
         """
         Main cleanup function
         
         Args:
             dry_run: If True, only show what would be deleted
             show_preview: If True, show preview of files before deleting
+            verbose: If True, print a line for every file processed
+            all_files: Result of an earlier get_all_files() call to reuse instead of rescanning
         """
         print("🧹" + "=" * 60)
         print("      LOCAL CLEANUP TOOL")
@@ -183,8 +246,11 @@ class LocalCleanup:
             print("⚠️  DRY RUN MODE - No files will actually be deleted")
             print()
         
-        # Get all files
-        all_files = self.get_all_files()
+        # Get all files (unless this instance already scanned them)
+        if all_files is None:
+            self.total_files = 0
+            self.total_size = 0
+            all_files = self.get_all_files()
         
         if self.total_files == 0:
             print("\n✅ No files found to delete!")
@@ -195,7 +261,7 @@ class LocalCleanup:
             self.list_files_preview(all_files)
         
         # Delete files
-        success, failed = self.delete_all_files(all_files, dry_run)
+        success, failed = self.delete_all_files(all_files, dry_run, verbose)
         
         if not dry_run and success > 0:
             print(f"\n🎉 Cleanup complete! Deleted {success} file(s)")
@@ -212,6 +278,7 @@ def main():
     # Configuration
     DRY_RUN = False  # Set to True to preview what would be deleted without actually deleting
     SHOW_PREVIEW = True  # Set to True to show preview of files before deleting
+    VERBOSE = False  # Set to True to print a line for every file processed
     
     print("\n⚙️  Configuration:")
     print(f"   Directories to clean:")
@@ -244,9 +311,8 @@ def main():
     
     # Run cleanup
     try:
-        # Create new instance to reset counters
-        cleanup = LocalCleanup(DIRECTORIES_TO_CLEAN)
-        cleanup.cleanup(dry_run=DRY_RUN, show_preview=SHOW_PREVIEW)
+        # Reuse the scan from the confirmation step
+        cleanup.cleanup(dry_run=DRY_RUN, show_preview=SHOW_PREVIEW, verbose=VERBOSE, all_files=temp_files)
         
     except KeyboardInterrupt:
         print("\n\n❌ Operation cancelled by user (Ctrl+C)")
@@ -5,8 +5,10 @@ Simple Flask app to search YouTube songs and get video URLs
 """
 
 from flask import Flask, render_template, request, jsonify, send_file
+from flask.json.provider import DefaultJSONProvider
 import os
 import re
+import shutil
 import requests
 import time
 from groq_service import fetch_music_query_response
@@ -18,16 +20,56 @@ from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
+from selenium.common.exceptions import TimeoutException
 import uuid
 import threading
+import queue
+import concurrent.futures
+import functools
 import gc
-import weakref
+from collections import OrderedDict
 from contextlib import contextmanager
 from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 app = Flask(__name__)
 
+class OrjsonProvider(DefaultJSONProvider):
+    """Flask JSON provider that encodes with orjson; jsonify() calls stay unchanged.
+
+    Only the public dumps/loads/response hooks are overridden. Anything orjson can't
+    encode (huge ints, mixed key types) falls back to the default provider.
+    """
+
+    def _encode(self, obj) -> bytes:
+        try:
+            return orjson.dumps(obj, default=self.default, option=orjson.OPT_NON_STR_KEYS)
+        except TypeError:
+            return super().dumps(obj).encode()
+
+    def dumps(self, obj, **kwargs):
+        if kwargs:
+            return super().dumps(obj, **kwargs)
+        return self._encode(obj).decode()
+
+    def loads(self, s, **kwargs):
+        if kwargs:
+            return super().loads(s, **kwargs)
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        if args and kwargs:
+            raise TypeError("app.json.response() takes either args or kwargs, not both")
+        obj = kwargs or (args[0] if len(args) == 1 else list(args) or None)
+        return self._app.response_class(self._encode(obj), mimetype=self.mimetype)
+
+if orjson is not None:
+    app.json = OrjsonProvider(app)
+
 # Create a global session with connection pooling and retry logic
 _http_session = None
 
@@ -36,13 +78,17 @@ def get_http_session():
     global _http_session
     if _http_session is None:
         _http_session = requests.Session()
+        # Fail fast for interactive searches: one quick retry, never sleep on Retry-After
         retry_strategy = Retry(
-            total=2,
-            backoff_factor=0.5,
+            total=1,
+            backoff_factor=0.2,
             status_forcelist=[429, 500, 502, 503, 504],
-            allowed_methods=["GET", "POST"]
+            allowed_methods=["GET", "POST"],
+            respect_retry_after_header=False
         )
-        adapter = HTTPAdapter(max_retries=retry_strategy, pool_connections=10, pool_maxsize=20)
+        # 20 per host covers the 8 search threads plus concurrent downloads; with
+        # pool_block=False a burst past that opens extra sockets instead of waiting
+        adapter = HTTPAdapter(max_retries=retry_strategy, pool_connections=10, pool_maxsize=20, pool_block=False)
         _http_session.mount("http://", adapter)
         _http_session.mount("https://", adapter)
     return _http_session
@@ -53,12 +99,58 @@ DOWNLOADS_FOLDER.mkdir(parents=True, exist_ok=True)
 DEBUG_FOLDER = Path("debug_artifacts")
 DEBUG_FOLDER.mkdir(parents=True, exist_ok=True)
 ENABLE_EZCONV_DEBUG = os.environ.get("ENABLE_EZCONV_DEBUG", "0") == "1"
+# Full collections walk the whole heap; only force them when chasing a leak
+FORCE_GC = os.environ.get("FORCE_GC", "0") == "1"
+
+# Each download runs its own Chrome, so cap how many run at once to bound memory
+DL_CONCURRENCY = max(1, int(os.environ.get("DL_CONCURRENCY", "2")))
+_download_slots = threading.BoundedSemaphore(DL_CONCURRENCY)
+
+# Searches are plain HTTP requests, so they share the pooled session across a few threads
+_search_executor = concurrent.futures.ThreadPoolExecutor(max_workers=8, thread_name_prefix="search")
+
+# Recent search hits keyed on the normalized song name; misses are not cached
+SEARCH_CACHE_TTL = 60
+SEARCH_CACHE_SIZE = 1024
+_search_cache: OrderedDict = OrderedDict()
+_search_cache_lock = threading.Lock()
+
+# Drivers that are still running; each owner discards its driver after quit()
+_active_drivers: set = set()
+_active_drivers_lock = threading.Lock()
+
+# Idle drivers kept warm so a download does not wait for Chrome to start (0 disables)
+WARM_DRIVERS = max(0, int(os.environ.get("WARM_DRIVERS", "1")))
+_driver_pool: queue.Queue = queue.Queue(maxsize=max(1, WARM_DRIVERS))
+_driver_pool_refill = threading.Event()
+# The refill thread is started by the first acquire_driver(), so importing app_web never launches Chrome
+_driver_pool_started = False
+_driver_pool_start_lock = threading.Lock()
+
+# Hard cap on running Chromes (warm pool + one per download slot); a slot is
+# reserved before Chrome starts and given back by quit_driver()
+MAX_LIVE_DRIVERS = WARM_DRIVERS + DL_CONCURRENCY
+_driver_budget = threading.BoundedSemaphore(MAX_LIVE_DRIVERS)
 
-# Limit concurrency to reduce memory pressure
-_download_lock = threading.Lock()
+# Precompiled patterns for song parsing, search results and download links
+# A numbered item runs until the next "N. title" / "N.title" or the end of its line.
+# Titles may start with a digit ("1.99 Luftballons" -> "99 Luftballons"), and a number
+# inside a title only ends the item if a real title follows it, so
+# "1. Hello - Adele 2015. 2. Hi" -> ["Hello - Adele 2015.", "Hi"]
+_SONG_ITEM_RE = re.compile(
+    r"(?:^|\s)(\d+)\.\s*((?!\d+\.\s)\S[^\n]*?)(?=\s+\d+\.(?:\s+(?!\d+\.\s)\S|[^\s\d])|\s*$)",
+    re.MULTILINE,
+)
+# Search pages are scanned as raw bytes; the ids are ASCII so no decode is needed
+_VIDEO_ID_RE = re.compile(rb'"videoId":"([a-zA-Z0-9_-]{11})"')
+_SHORTS_RE = re.compile(rb'/shorts/([a-zA-Z0-9_-]{11})')
+_MP3_URL_RE = re.compile(r'(https?://[^\s<>"]+\.mp3[^\s<>"]*)')
+_DOWNLOAD_HREF_RE = re.compile(r'href="(https?://[^"]+(?:download|\.mp3)[^"]*)"')
 
-# Memory optimization: Use weak references for temporary objects
-_active_drivers = weakref.WeakSet()
+# Search pages are streamed; a candidate is only trusted once this much HTML follows it,
+# which is enough to see its '/shorts/' link if it has one
+SEARCH_CHUNK_SIZE = 16384
+SHORTS_LOOKAHEAD = 32768
 
 @contextmanager
 def memory_efficient_context():
@@ -66,61 +158,113 @@ def memory_efficient_context():
     try:
         yield
     finally:
-        # Force garbage collection after operations
-        gc.collect()
+        if FORCE_GC:
+            gc.collect()
 
 def cleanup_memory():
     """Aggressive memory cleanup."""
-    # Close any remaining drivers
-    for driver in list(_active_drivers):
+    # Empty the warm pool, then close any remaining drivers
+    while True:
         try:
-            driver.quit()
-        except Exception:
-            pass
-    _active_drivers.clear()
-    
-    # Force garbage collection
-    gc.collect()
+            _driver_pool.get_nowait()
+        except queue.Empty:
+            break
+    for driver in list(_active_drivers):
+        quit_driver(driver)
+    if WARM_DRIVERS and _driver_pool_started:
+        _driver_pool_refill.set()  # Warm the pool back up for the next download
+    if FORCE_GC:
+        gc.collect()
 
 def parse_song_list(song_input: str) -> list[str]:
-    """Parse numbered song list from text input."""
-    songs: list[str] = []
+    """Parse numbered song list from text input.
+
+    Handles both single-line ("1. A 2. B 3. C") and one-per-line input in one pass.
+    """
     if not song_input or not song_input.strip():
-        return songs
-    buffer = song_input.strip()
-    # Handle single-line input like "1. A 2. B 3. C"
-    if "\n" not in buffer and re.search(r"\d+\.\s*\w", buffer):
-        parts = re.findall(r"(\d+\.)\s*([^0-9]*?)(?=\d+\.|$)", buffer)
-        if parts:
-            for _, title in parts:
-                song_name = re.sub(r"\s+", " ", title.strip())
-                if song_name:
-                    songs.append(song_name)
-    # Handle multi-line input or if single-line parsing yielded nothing
-    if not songs:
-        numbered_item_regex = re.compile(r"\b(\d+)\.\s*([^\d].*?)(?=\s*\d+\.|$)", re.DOTALL)
-        matches = numbered_item_regex.findall(buffer)
-        if matches:
-            for _, title in matches:
-                song_name = re.sub(r"\s+", " ", title.strip())
-                if song_name:
-                    songs.append(song_name)
-        else:
-            line_regex = re.compile(r"^\s*\d+\.\s*(.+)$")
-            for raw in buffer.splitlines():
-                m = line_regex.match(raw.strip())
-                if m:
-                    song_name = re.sub(r"\s+", " ", m.group(1).strip())
-                    if song_name:
-                        songs.append(song_name)
-    return songs
+        return []
+    return [" ".join(title.split()) for _, title in _SONG_ITEM_RE.findall(song_input.strip()) if title.strip()]
 
 def is_shorts_url(video_id: str, html_content: str) -> bool:
     """Check if video ID belongs to a shorts video by looking for '/shorts/VIDEOID' in HTML."""
     return f"/shorts/{video_id}" in html_content
 
+class LongFormIdScanner:
+    """Pick the first non-shorts video id from search HTML as it streams in.
+
+    Each feed() only scans the bytes that arrived since the last call, keeping the
+    candidate ids, the '/shorts/' ids and the scan offsets between calls. Until the
+    page is complete, a candidate is only accepted once SHORTS_LOOKAHEAD bytes follow it.
+    """
+    # Longest match of each pattern, so a match cut by a chunk boundary is rescanned
+    _VIDEO_ID_SPAN = len(b'"videoId":"') + 12
+    _SHORTS_SPAN = len(b'/shorts/') + 11
+    MAX_CANDIDATES = 15
+
+    def __init__(self):
+        self.html = bytearray()
+        self.id_pos = 0
+        self.shorts_pos = 0
+        self.seen: set[bytes] = set()
+        self.candidates: list[tuple[bytes, int]] = []  # (video_id, match end), first-seen order
+        self.next_candidate = 0
+        self.shorts_ids: set[bytes] = set()
+
+    def _scan(self) -> None:
+        size = len(self.html)
+        if len(self.candidates) <= self.MAX_CANDIDATES:
+            end = self.id_pos
+            for match in _VIDEO_ID_RE.finditer(self.html, self.id_pos):
+                end = match.end()
+                video_id = match.group(1)
+                if video_id not in self.seen:
+                    self.seen.add(video_id)
+                    self.candidates.append((video_id, end))
+                    if len(self.candidates) > self.MAX_CANDIDATES:
+                        break
+            self.id_pos = max(end, size - self._VIDEO_ID_SPAN + 1, self.id_pos)
+        end = self.shorts_pos
+        for match in _SHORTS_RE.finditer(self.html, self.shorts_pos):
+            end = match.end()
+            self.shorts_ids.add(match.group(1))
+        self.shorts_pos = max(end, size - self._SHORTS_SPAN + 1, self.shorts_pos)
+
+    def feed(self, chunk: bytes, complete: bool = False) -> tuple[bytes | None, bool, bool]:
+        """Add a chunk and return (video_id, seen_any, decided)."""
+        self.html += chunk
+        self._scan()
+        while self.next_candidate < len(self.candidates):
+            if self.next_candidate >= self.MAX_CANDIDATES:
+                return None, True, True
+            video_id, end = self.candidates[self.next_candidate]
+            if not complete and len(self.html) - end < SHORTS_LOOKAHEAD:
+                return None, True, False
+            if video_id in self.shorts_ids:
+                self.next_candidate += 1
+                continue
+            return video_id, True, True
+        return None, bool(self.candidates), complete
+
 def search_youtube_video(song_name: str, max_retries: int = 2) -> str | None:
-    """Search YouTube for a song and return long-form video URL."""
+    """Search YouTube for a song and return long-form video URL, reusing recent hits."""
+    key = " ".join(song_name.lower().split())
+    now = time.monotonic()
+    with _search_cache_lock:
+        cached = _search_cache.get(key)
+        if cached is not None and now - cached[0] < SEARCH_CACHE_TTL:
+            _search_cache.move_to_end(key)
+            return cached[1]
+    video_url = fetch_youtube_video_url(song_name)
+    if video_url:
+        with _search_cache_lock:
+            _search_cache[key] = (now, video_url)
+            _search_cache.move_to_end(key)
+            if len(_search_cache) > SEARCH_CACHE_SIZE:
+                _search_cache.popitem(last=False)
+    return video_url
+
+def fetch_youtube_video_url(song_name: str) -> str | None:
+    """Fetch the YouTube results page for a song and return the first long-form video URL."""
     try:
         search_query = song_name.replace(" ", "+")
         search_url = f"https://www.youtube.com/results?search_query={search_query}"
@@ -131,20 +275,23 @@ def search_youtube_video(song_name: str, max_retries: int = 2) -> str | None:
         }
         # Use session with connection pooling and shorter timeout
         session = get_http_session()
-        response = session.get(search_url, headers=headers, timeout=8)
-        if response.status_code != 200:
-            print(f"YouTube search failed with status {response.status_code}")
-            return None
-        video_id_pattern = r'"videoId":"([a-zA-Z0-9_-]{11})"'
-        matches = re.findall(video_id_pattern, response.text)
-        if not matches:
+        with session.get(search_url, headers=headers, timeout=8, stream=True) as response:
+            if response.status_code != 200:
+                print(f"YouTube search failed with status {response.status_code}")
+                return None
+            scanner = LongFormIdScanner()
+            video_id, seen_any, decided = None, False, False
+            for chunk in response.iter_content(chunk_size=SEARCH_CHUNK_SIZE):
+                video_id, seen_any, decided = scanner.feed(chunk)
+                if decided:
+                    break
+            if not decided:
+                video_id, seen_any, _ = scanner.feed(b"", complete=True)
+        if not seen_any:
             print(f"No video IDs found for: {song_name}")
             return None
-        for video_id in matches[:15]:
-            if f"/shorts/{video_id}" in response.text:
-                continue
-            if len(video_id) == 11:
-                return f"https://www.youtube.com/watch?v={video_id}"
+        if video_id:
+            return f"https://www.youtube.com/watch?v={video_id.decode('ascii')}"
         return None
     except requests.Timeout:
         print(f"Timeout searching for: {song_name}")
@@ -160,107 +307,127 @@ def search_youtube_video(song_name: str, max_retries: int = 2) -> str | None:
 def index():
     return render_template("index.html")
 
-def setup_selenium_driver():
-    """Setup headless Chrome driver for Selenium with aggressive memory optimization."""
-    chrome_options = Options()
-    chrome_options.add_argument("--headless=new")
-    chrome_options.add_argument("--no-sandbox")
-    chrome_options.add_argument("--disable-dev-shm-usage")
-    chrome_options.add_argument("--disable-gpu")
-    chrome_options.add_argument("--window-size=1024,768")  # Smaller window
-    chrome_options.add_argument("--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36")
+DOWNLOAD_MP3_XPATH = "//*[self::a or self::button][contains(translate(normalize-space(.), 'abcdefghijklmnopqrstuvwxyz', 'ABCDEFGHIJKLMNOPQRSTUVWXYZ'), 'DOWNLOAD MP3')]"
 
-    # Aggressive memory optimization flags
-    chrome_options.add_argument("--memory-pressure-off")
-    chrome_options.add_argument("--max_old_space_size=512")  # Limit V8 heap
-    chrome_options.add_argument("--disable-background-timer-throttling")
-    chrome_options.add_argument("--disable-renderer-backgrounding")
-    chrome_options.add_argument("--disable-backgrounding-occluded-windows")
-    chrome_options.add_argument("--disable-features=TranslateUI")
-    chrome_options.add_argument("--disable-ipc-flooding-protection")
-    chrome_options.add_argument("--disable-background-networking")
-    chrome_options.add_argument("--disable-default-apps")
-    chrome_options.add_argument("--disable-extensions")
-    chrome_options.add_argument("--disable-sync")
-    chrome_options.add_argument("--disable-translate")
-    chrome_options.add_argument("--hide-scrollbars")
-    chrome_options.add_argument("--mute-audio")
-    chrome_options.add_argument("--no-first-run")
-    chrome_options.add_argument("--disable-logging")
-    chrome_options.add_argument("--disable-permissions-api")
-    chrome_options.add_argument("--disable-plugins")
-    chrome_options.add_argument("--disable-web-security")
-    chrome_options.add_argument("--disable-features=VizDisplayCompositor")
-    chrome_options.add_argument("--single-process")  # Single process mode for lower memory
-    chrome_options.add_argument("--no-zygote")  # Disable zygote process
+# Looks for the Download MP3 control in the page, then in same-origin iframes, in one round trip.
+# Returns ["button", element], ["frame", iframe] or null.
+FIND_DOWNLOAD_JS = """
+const match = (doc) => {
+    for (const el of doc.querySelectorAll("a, button")) {
+        if (/download\\s+mp3/i.test(el.textContent)) return el;
+    }
+    return null;
+};
+const el = match(document);
+if (el) return ["button", el];
+for (const frame of document.querySelectorAll("iframe")) {
+    try {
+        if (frame.contentDocument && match(frame.contentDocument)) return ["frame", frame];
+    } catch (e) {}
+}
+return null;
+"""
 
+# Chrome flags and prefs are fixed, so build them once and reuse them for every driver
+CHROME_ARGS = (
+    "--headless=new",
+    "--no-sandbox",
+    "--disable-dev-shm-usage",
+    "--disable-gpu",
+    "--window-size=1024,768",  # Smaller window
+    "--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36",
+    # Aggressive memory optimization flags
+    "--memory-pressure-off",
+    "--max_old_space_size=512",  # Limit V8 heap
+    "--disable-background-timer-throttling",
+    "--disable-renderer-backgrounding",
+    "--disable-backgrounding-occluded-windows",
+    # Chrome keeps only one --disable-features switch, so list every feature here
+    "--disable-features=TranslateUI,VizDisplayCompositor,AudioServiceOutOfProcess",
+    "--disable-ipc-flooding-protection",
+    "--disable-background-networking",
+    "--disable-default-apps",
+    "--disable-extensions",
+    "--disable-sync",
+    "--disable-translate",
+    "--hide-scrollbars",
+    "--mute-audio",
+    "--no-first-run",
+    "--disable-logging",
+    "--disable-permissions-api",
+    "--disable-plugins",
+    "--disable-web-security",
+    "--single-process",  # Single process mode for lower memory
+    "--no-zygote",  # Disable zygote process
     # Light anti-automation adjustments
-    try:
-        chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
-        chrome_options.add_experimental_option("useAutomationExtension", False)
-        chrome_options.add_argument("--disable-blink-features=AutomationControlled")
-    except Exception:
-        pass
+    "--disable-blink-features=AutomationControlled",
+    # Additional memory/perf flags
+    "--blink-settings=imagesEnabled=false",
+    "--media-cache-size=0",
+    "--disk-cache-size=0",
+    "--aggressive-cache-discard",
+    "--enable-low-res-tiling",
+    "--disable-background-mode",
+    "--disable-client-side-phishing-detection",
+    "--disable-component-update",
+    "--disable-domain-reliability",
+    "--disable-hang-monitor",
+    "--disable-prompt-on-repost",
+    "--disable-rtc-smoothness-algorithm",
+    "--disable-speech-api",
+    "--disable-speech-synthesis-api",
+    "--disable-webgl",
+    "--disable-webgl2",
+    "--force-color-profile=srgb",
+    "--metrics-recording-only",
+    "--no-default-browser-check",
+    "--no-pings",
+    "--no-service-autorun",
+    "--password-store=basic",
+    "--use-mock-keychain",
+    "--disable-component-extensions-with-background-pages",
+)
 
-    prefs = {
-        "download.default_directory": str(DOWNLOADS_FOLDER.absolute()),
-        "download.prompt_for_download": False,
-        "download.directory_upgrade": True,
-        "safebrowsing.enabled": True,
-        # Block images to save memory/bandwidth
-        "profile.managed_default_content_settings.images": 2,
-        # Block notifications/popups where possible
-        "profile.default_content_setting_values.notifications": 2,
-        "profile.default_content_setting_values.popups": 2,
-        # Additional memory optimizations
-        "profile.default_content_setting_values.plugins": 2,
-        "profile.default_content_setting_values.geolocation": 2,
-        "profile.default_content_setting_values.media_stream": 2,
-        "profile.default_content_setting_values.automatic_downloads": 2,
-        "profile.default_content_setting_values.midi_sysex": 2,
-        "profile.default_content_setting_values.push_messaging": 2,
-        "profile.default_content_setting_values.mixed_script": 2,
-        "profile.default_content_setting_values.unsandboxed_plugins": 2,
-        "profile.default_content_setting_values.ppapi_broker": 2,
-        # Disable hardware acceleration
-        "hardware_acceleration_mode": 0,
-        # Reduce memory usage
-        "profile.content_settings.exceptions.automatic_downloads": {},
-        "profile.content_settings.exceptions.notifications": {},
-        "profile.content_settings.exceptions.geolocation": {},
-        "profile.content_settings.exceptions.media_stream": {},
-    }
-    chrome_options.add_experimental_option("prefs", prefs)
+CHROME_PREFS = {
+    "download.default_directory": str(DOWNLOADS_FOLDER.absolute()),
+    "download.prompt_for_download": False,
+    "download.directory_upgrade": True,
+    "safebrowsing.enabled": True,
+    # Block images to save memory/bandwidth
+    "profile.managed_default_content_settings.images": 2,
+    # Block notifications/popups where possible
+    "profile.default_content_setting_values.notifications": 2,
+    "profile.default_content_setting_values.popups": 2,
+    # Additional memory optimizations
+    "profile.default_content_setting_values.plugins": 2,
+    "profile.default_content_setting_values.geolocation": 2,
+    "profile.default_content_setting_values.media_stream": 2,
+    "profile.default_content_setting_values.automatic_downloads": 2,
+    "profile.default_content_setting_values.midi_sysex": 2,
+    "profile.default_content_setting_values.push_messaging": 2,
+    "profile.default_content_setting_values.mixed_script": 2,
+    "profile.default_content_setting_values.unsandboxed_plugins": 2,
+    "profile.default_content_setting_values.ppapi_broker": 2,
+    # Disable hardware acceleration
+    "hardware_acceleration_mode": 0,
+    # Reduce memory usage
+    "profile.content_settings.exceptions.automatic_downloads": {},
+    "profile.content_settings.exceptions.notifications": {},
+    "profile.content_settings.exceptions.geolocation": {},
+    "profile.content_settings.exceptions.media_stream": {},
+}
 
-    # Additional memory/perf flags
-    chrome_options.add_argument("--blink-settings=imagesEnabled=false")
-    chrome_options.add_argument("--media-cache-size=0")
-    chrome_options.add_argument("--disk-cache-size=0")
-    chrome_options.add_argument("--aggressive-cache-discard")
-    chrome_options.add_argument("--enable-low-res-tiling")
-    chrome_options.add_argument("--disable-background-mode")
-    chrome_options.add_argument("--disable-client-side-phishing-detection")
-    chrome_options.add_argument("--disable-component-update")
-    chrome_options.add_argument("--disable-domain-reliability")
-    chrome_options.add_argument("--disable-features=AudioServiceOutOfProcess")
-    chrome_options.add_argument("--disable-hang-monitor")
-    chrome_options.add_argument("--disable-prompt-on-repost")
-    chrome_options.add_argument("--disable-rtc-smoothness-algorithm")
-    chrome_options.add_argument("--disable-speech-api")
-    chrome_options.add_argument("--disable-speech-synthesis-api")
-    chrome_options.add_argument("--disable-webgl")
-    chrome_options.add_argument("--disable-webgl2")
-    chrome_options.add_argument("--force-color-profile=srgb")
-    chrome_options.add_argument("--metrics-recording-only")
-    chrome_options.add_argument("--no-default-browser-check")
-    chrome_options.add_argument("--no-pings")
-    chrome_options.add_argument("--no-service-autorun")
-    chrome_options.add_argument("--password-store=basic")
-    chrome_options.add_argument("--use-mock-keychain")
-    chrome_options.add_argument("--disable-component-extensions-with-background-pages")
-    chrome_options.add_argument("--disable-background-timer-throttling")
-    chrome_options.add_argument("--disable-renderer-backgrounding")
-    chrome_options.add_argument("--disable-backgrounding-occluded-windows")
+def setup_selenium_driver():
+    """Setup headless Chrome driver for Selenium with aggressive memory optimization."""
+    if not _driver_budget.acquire(blocking=False):
+        print(f"Not starting Chrome: {MAX_LIVE_DRIVERS} drivers already running")
+        return None
+    chrome_options = Options()
+    for arg in CHROME_ARGS:
+        chrome_options.add_argument(arg)
+    chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
+    chrome_options.add_experimental_option("useAutomationExtension", False)
+    chrome_options.add_experimental_option("prefs", CHROME_PREFS)
 
     try:
         chromedriver_path = os.environ.get("CHROMEDRIVER_PATH", "/usr/bin/chromedriver")
@@ -276,13 +443,94 @@ def setup_selenium_driver():
             driver = webdriver.Chrome(options=chrome_options)
         
         # Track driver for cleanup
-        _active_drivers.add(driver)
+        with _active_drivers_lock:
+            _active_drivers.add(driver)
         return driver
     except Exception as e:
         print(f"Error setting up Selenium driver: {e}")
-        cleanup_memory()  # Cleanup on error
+        _driver_budget.release()
         return None
             
+def quit_driver(driver) -> None:
+    """Quit a driver, stop tracking it and free its slot in the live-driver budget."""
+    with _active_drivers_lock:
+        if driver not in _active_drivers:
+            return  # Already quit by someone else
+        _active_drivers.discard(driver)
+    try:
+        driver.quit()
+    except Exception:
+        pass
+    _driver_budget.release()
+
+def start_driver_pool() -> None:
+    """Start the warm-pool refill thread once.
+
+    The pool is not pre-filled: the first download's driver goes into it on release.
+    """
+    global _driver_pool_started
+    with _driver_pool_start_lock:
+        if _driver_pool_started:
+            return
+        _driver_pool_started = True
+    threading.Thread(target=refill_driver_pool, name="driver-pool", daemon=True).start()
+
+def acquire_driver():
+    """Take a live driver from the warm pool, or start a new one if the pool is empty."""
+    if WARM_DRIVERS:
+        start_driver_pool()
+        while True:
+            try:
+                driver = _driver_pool.get_nowait()
+            except queue.Empty:
+                break
+            try:
+                driver.current_url  # Cheap liveness check
+                return driver
+            except Exception:
+                quit_driver(driver)
+                _driver_pool_refill.set()
+    return setup_selenium_driver()
+
+def release_driver(driver) -> None:
+    """Reset a used driver and put it back in the warm pool, or quit it if it can't be reused."""
+    if WARM_DRIVERS:
+        try:
+            handles = driver.window_handles
+            for handle in handles[1:]:
+                driver.switch_to.window(handle)
+                driver.close()
+            driver.switch_to.window(handles[0])
+            driver.execute_cdp_cmd("Network.clearBrowserCookies", {})
+            driver.execute_script("try { localStorage.clear(); sessionStorage.clear(); } catch (e) {}")
+            driver.get("about:blank")
+        except Exception:
+            # Broken driver: drop it and let the refill thread start a replacement
+            quit_driver(driver)
+            _driver_pool_refill.set()
+            return
+        try:
+            _driver_pool.put_nowait(driver)
+            return
+        except queue.Full:
+            pass  # Pool already warm; this one was an extra for a concurrent download
+    quit_driver(driver)
+
+def refill_driver_pool() -> None:
+    """Background loop that tops the warm pool back up to WARM_DRIVERS when a pooled driver is lost."""
+    while True:
+        _driver_pool_refill.wait()
+        _driver_pool_refill.clear()
+        while _driver_pool.qsize() < WARM_DRIVERS:
+            driver = setup_selenium_driver()
+            if not driver:
+                break  # Chrome failed or the budget is full; retried on the next refill request
+            try:
+                _driver_pool.put_nowait(driver)
+            except queue.Full:
+                quit_driver(driver)
+                break
+
 def save_debug(driver, debug_dir: Path, label: str) -> None:
     """Save page HTML and screenshot for debugging."""
     if not ENABLE_EZCONV_DEBUG:
@@ -322,6 +570,29 @@ def try_click(driver, element) -> bool:
     except Exception:
         return False
 
+def find_download_control(driver):
+    """Locate the Download MP3 control in the page or a same-origin iframe with one script call.
+
+    When the control is inside an iframe, the driver is left switched into that frame.
+    """
+    found = driver.execute_script(FIND_DOWNLOAD_JS)
+    if not found:
+        return None
+    kind, element = found
+    if kind != "frame":
+        return element
+    driver.switch_to.frame(element)
+    elems = driver.find_elements(By.XPATH, DOWNLOAD_MP3_XPATH)
+    if elems:
+        return elems[0]
+    driver.switch_to.default_content()
+    return None
+
+def extract_download_link(html: str) -> str | None:
+    """Find an MP3 or download URL in page HTML with a regex pass instead of element lookups."""
+    match = _MP3_URL_RE.search(html) or _DOWNLOAD_HREF_RE.search(html)
+    return match.group(1) if match else None
+
 def handle_consent_and_popups(driver) -> None:
     """Try to accept cookie banners and close ad popups if any."""
     selectors = [
@@ -329,14 +600,13 @@ def handle_consent_and_popups(driver) -> None:
         (By.CSS_SELECTOR, "button#onetrust-accept-btn-handler"),
         (By.XPATH, "//button[contains(translate(., 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz'), 'accept')]")
     ]
-    for by, sel in selectors:
-        try:
-            btn = WebDriverWait(driver, 3).until(EC.element_to_be_clickable((by, sel)))
-            if try_click(driver, btn):
-                print("[DEBUG] Cookie/consent banner accepted")
-                break
-        except Exception:
-            pass
+    # One wait for whichever banner button shows up, instead of 3s per selector
+    try:
+        btn = WebDriverWait(driver, 3).until(EC.any_of(*(EC.element_to_be_clickable(sel) for sel in selectors)))
+        if try_click(driver, btn):
+            print("[DEBUG] Cookie/consent banner accepted")
+    except Exception:
+        pass
 
     # Close extra windows (ads)
     try:
@@ -360,23 +630,22 @@ def download_audio():
         print(f"Starting audio download for: {youtube_url}")
         debug_id = uuid.uuid4().hex[:8]
         debug_dir = DEBUG_FOLDER / f"job_{debug_id}"
-        if not _download_lock.acquire(blocking=False):
+        if not _download_slots.acquire(timeout=0.1):
             return jsonify({"success": False, "message": "Server busy. Please try again in a moment."})
         driver = None
         try:
-            driver = setup_selenium_driver()
+            driver = acquire_driver()
             if not driver:
                 return jsonify({"success": False, "message": "Failed to initialize browser"})
             print("Navigating to ezconv.com...")
             driver.get("https://ezconv.com/v820")
-            time.sleep(2)
+            url_input_locator = (By.CSS_SELECTOR, "input[type='text']")
+            WebDriverWait(driver, 10).until(EC.presence_of_element_located(url_input_locator))
             save_debug(driver, debug_dir, "01_loaded")
             handle_consent_and_popups(driver)
             save_debug(driver, debug_dir, "02_after_consent")
             print("Looking for URL input field...")
-            url_input = WebDriverWait(driver, 10).until(
-                EC.presence_of_element_located((By.CSS_SELECTOR, "input[type='text']"))
-            )
+            url_input = WebDriverWait(driver, 10).until(EC.presence_of_element_located(url_input_locator))
             url_input.clear()
             url_input.send_keys(youtube_url)
             try:
@@ -411,127 +680,86 @@ def download_audio():
                 save_debug(driver, debug_dir, "04_convert_click_failed")
                 return jsonify({"success": False, "message": "Failed to click Convert button", "debug_id": debug_id})
             print("Convert button clicked")
-            time.sleep(1)
+            # Give the page up to a second to react (re-render or ad popup) before clearing popups
+            try:
+                WebDriverWait(driver, 1, poll_frequency=0.2).until(EC.any_of(
+                    EC.staleness_of(convert_button), EC.number_of_windows_to_be(2)
+                ))
+            except TimeoutException:
+                pass
             handle_consent_and_popups(driver)
             save_debug(driver, debug_dir, "05_after_convert_click")
             print("Waiting for conversion to complete...")
             download_button = None
             max_wait_time = 90
             try:
-                dl_locators = [
-                    (By.XPATH, "//button[normalize-space()='Download MP3']"),
-                    (By.XPATH, "//a[normalize-space()='Download MP3']"),
-                    (By.XPATH, "//*[self::a or self::button][contains(translate(normalize-space(.), 'abcdefghijklmnopqrstuvwxyz', 'ABCDEFGHIJKLMNOPQRSTUVWXYZ'), 'DOWNLOAD MP3')]")
-                ]
-                for seconds_elapsed in range(max_wait_time):
-                    found = False
-                    for by, sel in dl_locators:
-                        try:
-                            elem = driver.find_element(by, sel)
-                            download_button = elem
-                            found = True
-                            break
-                        except Exception:
-                            pass
-                    if not found:
-                        try:
-                            frames = driver.find_elements(By.TAG_NAME, "iframe")
-                            for frame in frames:
-                                driver.switch_to.frame(frame)
-                                for by, sel in dl_locators:
-                                    try:
-                                        elem = driver.find_element(by, sel)
-                                        download_button = elem
-                                        found = True
-                                        break
-                                    except Exception:
-                                        pass
-                                driver.switch_to.default_content()
-                                if found:
-                                    break
-                        except Exception:
-                            driver.switch_to.default_content()
-                    if found:
-                        print(f"✅ Download MP3 control appeared after {seconds_elapsed + 1} seconds!")
-                        break
-                    time.sleep(1)
-                    if (seconds_elapsed + 1) % 5 == 0:
-                        print(f"   ⏳ Still converting... ({seconds_elapsed + 1}s elapsed)")
+                wait_started = time.monotonic()
+                try:
+                    download_button = WebDriverWait(driver, max_wait_time, poll_frequency=0.5).until(find_download_control)
+                    print(f"✅ Download MP3 control appeared after {time.monotonic() - wait_started:.1f} seconds!")
+                except TimeoutException:
+                    download_button = None
                 if not download_button:
                     print(f"❌ Timeout: Download button did not appear after {max_wait_time} seconds")
                     save_debug(driver, debug_dir, "06_timeout_no_download")
                     return jsonify({"success": False, "message": f"Conversion timeout after {max_wait_time} seconds", "debug_id": debug_id})
-                time.sleep(1)
                 try:
                     download_button = WebDriverWait(driver, 10).until(
-                        EC.element_to_be_clickable((By.XPATH, "//*[self::a or self::button][contains(translate(normalize-space(.), 'abcdefghijklmnopqrstuvwxyz', 'ABCDEFGHIJKLMNOPQRSTUVWXYZ'), 'DOWNLOAD MP3')]")
-                    ))
+                        EC.element_to_be_clickable((By.XPATH, DOWNLOAD_MP3_XPATH))
+                    )
                 except Exception:
                     pass
                 print("Download button is clickable, getting download link...")
                 download_link = download_button.get_attribute("href")
                 if not download_link:
-                    onclick = download_button.get_attribute("onclick")
-                    if onclick:
-                        print(f"Found onclick: {onclick}")
-                    try:
-                        parent = download_button.find_element(By.XPATH, "..")
-                        download_link = parent.get_attribute("href")
-                    except Exception:
-                        pass
-                if not download_link:
-                    download_links = driver.find_elements(By.CSS_SELECTOR, "a[href*='download'], a[download]")
-                    if download_links:
-                        download_link = download_links[0].get_attribute("href")
-                        print(f"Found download link via CSS selector: {download_link}")
+                    download_link = extract_download_link(driver.page_source)
+                    if download_link:
+                        print(f"Found download link in page source: {download_link}")
                 print("Clicking Download MP3 button...")
+                previous_url = driver.current_url
                 if not try_click(driver, download_button):
                     driver.execute_script("arguments[0].click();", download_button)
-                time.sleep(3)
-                time.sleep(2)
+                # Wait for a redirect to the file; less time is needed once we already have a link
+                try:
+                    WebDriverWait(driver, 2 if download_link else 5, poll_frequency=0.25).until(EC.url_changes(previous_url))
+                except TimeoutException:
+                    pass
                 current_url = driver.current_url
                 print(f"Current URL after click: {current_url}")
                 if "download" in current_url.lower() or ".mp3" in current_url.lower():
                     download_link = current_url
                     print(f"Download link from redirect: {download_link}")
-                if not download_link:
-                    print("Looking for download links on page...")
-                    download_links = driver.find_elements(By.CSS_SELECTOR, "a[href*='download'], a[href*='.mp3'], a[download]")
-                    if download_links:
-                        download_link = download_links[0].get_attribute("href")
-                        print(f"Found download link: {download_link}")
                 if not download_link:
                     print("Trying to extract download URL from page source...")
-                    page_source = driver.page_source
-                    mp3_pattern = r'(https?://[^\s<>"]+\.mp3[^\s<>"]*)'
-                    matches = re.findall(mp3_pattern, page_source)
-                    if matches:
-                        download_link = matches[0]
+                    download_link = extract_download_link(driver.page_source)
+                    if download_link:
                         print(f"Extracted download link from source: {download_link}")
                 if download_link:
                     print(f"Final download link: {download_link}")
                     download_link = download_link.replace("&amp;", "&")
                     print("Starting download via requests...")
-                    session = requests.Session()
-                    session.headers.update({
+                    headers = {
                         "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/119.0.0.0 Safari/537.36",
                         "Referer": current_url,
                         "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8",
-                    })
+                    }
+                    # Per-request cookie jar so browser cookies never leak into the shared session
+                    cookie_jar = requests.cookies.RequestsCookieJar()
                     try:
                         for c in driver.get_cookies():
-                            session.cookies.set(c.get("name"), c.get("value"))
+                            cookie_jar.set(c.get("name"), c.get("value"))
                     except Exception:
                         pass
-                    response = session.get(download_link, stream=True, timeout=60, allow_redirects=True)
+                    session = get_http_session()
+                    response = session.get(download_link, headers=headers, cookies=cookie_jar, stream=True, timeout=60, allow_redirects=True)
                     response.raise_for_status()
                     filename = f"audio_{uuid.uuid4().hex[:8]}.mp3"
                     filepath = DOWNLOADS_FOLDER / filename
                     print(f"Saving to: {filepath}")
-                    with open(filepath, "wb") as f:
-                        for chunk in response.iter_content(chunk_size=8192):
-                            if chunk:
-                                f.write(chunk)
+                    # Let urllib3 undo any gzip/deflate, then copy in 1MB blocks
+                    response.raw.decode_content = True
+                    with response, open(filepath, "wb") as f:
+                        shutil.copyfileobj(response.raw, f, length=1 << 20)
                     print(f"Audio downloaded successfully: {filename}")
                     return jsonify({
                         "success": True,
@@ -551,14 +779,10 @@ def download_audio():
             print(f"Error during automation: {str(e)}")
             return jsonify({"success": False, "message": f"Automation error: {str(e)[:100]}", "debug_id": debug_id})
         finally:
-            try:
-                if driver:
-                    driver.quit()
-                    _active_drivers.discard(driver)
-            except Exception:
-                pass
-            cleanup_memory()
-            _download_lock.release()
+            # Only touch our own driver; other downloads may still be running
+            if driver:
+                release_driver(driver)
+            _download_slots.release()
 
 @app.route("/audio/<filename>")
 def serve_audio(filename):
@@ -580,15 +804,10 @@ def search_songs():
             songs = parse_song_list(song_input)
             if not songs:
                 return jsonify({"success": False, "message": "No valid songs found! Please use format: 1. Song Name"})
+            print(f"Searching {len(songs)} songs...")
             results = []
-            for i, song in enumerate(songs, 1):
-                print(f"Searching {i}/{len(songs)}: {song}")
-                video_url = search_youtube_video(song)
+            for i, (song, video_url) in enumerate(zip(songs, _search_executor.map(search_youtube_video, songs)), 1):
                 results.append({"number": i, "song": song, "url": video_url, "status": "success" if video_url else "failed"})
-                if i < len(songs):
-                    time.sleep(0.5)
-                    if i % 3 == 0:
-                        gc.collect()
             return jsonify({"success": True, "total": len(songs), "results": results})
         except Exception as e:
             return jsonify({"success": False, "message": f"Error: {str(e)}"})
@@ -602,6 +821,23 @@ def cleanup_endpoint():
     except Exception as e:
         return jsonify({"success": False, "message": f"Cleanup error: {str(e)}"})
 
+@functools.lru_cache(maxsize=512)
+def _parse_ai_songs_cached(text: str) -> tuple:
+    return tuple(parse_songs_from_ai_response(text))
+
+def parse_ai_songs(text: str) -> list:
+    """Cached parse_songs_from_ai_response(); returns a fresh list of fresh dicts each call."""
+    return [dict(song) for song in _parse_ai_songs_cached(text)]
+
+def get_ai_answer(query: str) -> tuple[dict, list]:
+    """Return (response, detected_songs) for a query.
+
+    Answers are cached (with the time-sensitive TTL policy) inside
+    fetch_music_query_response(); the song list is cached per response text.
+    """
+    response = fetch_music_query_response(query)
+    return response, parse_ai_songs(response['text'])
+
 @app.route("/api/ai-chat", methods=["POST"])
 def ai_chat():
     """AI Music Assistant endpoint - handles music-related queries"""
@@ -617,11 +853,8 @@ def ai_chat():
         
         print(f"🎵 AI Chat Query: {query}")
         
-        # Get AI response using Groq service
-        response = fetch_music_query_response(query)
-        
-        # Parse songs from the AI response
-        detected_songs = parse_songs_from_ai_response(response['text'])
+        # Get AI response using Groq service and parse songs from it
+        response, detected_songs = get_ai_answer(query)
         
         print(f"✅ AI response generated, detected {len(detected_songs)} songs")
         
@@ -654,7 +887,7 @@ def parse_songs():
             })
         
         # Parse songs from the text
-        songs = parse_songs_from_ai_response(text)
+        songs = parse_ai_songs(text)
         
         return jsonify({
             "success": True,
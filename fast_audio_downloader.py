@@ -6,18 +6,139 @@ Quickly download MP3 audio from multiple YouTube URLs
 
 import os
 import sys
-import subprocess
 import time
 from pathlib import Path
 import concurrent.futures
 import threading
 import re
+import sqlite3
+import itertools
 import requests
+import yt_dlp
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from dotenv import load_dotenv
 
 # Load environment variables
 load_dotenv()
 
+# Precompiled patterns for filename cleaning and video ID extraction
+_SPECIAL_CHARS_RE = re.compile(r'[^a-zA-Z0-9\s._-]')
+_MULTISPACE_RE = re.compile(r'\s+')
+# Anything clean_filename_simple() would change: a special char, a double space or edge spaces
+_NEEDS_CLEANING_RE = re.compile(r'[^a-zA-Z0-9 ._-]| {2}|^ | $')
+_VIDEO_ID_RE = re.compile(r'(?:youtube\.com/watch\?v=|youtu\.be/)([a-zA-Z0-9_-]{11})')
+
+# Video titles survive between runs here
+METADATA_CACHE_PATH = Path.home() / '.cache' / 'fast_yt' / 'metadata.db'
+# videos.list accepts at most this many comma-separated IDs per call
+API_BATCH_SIZE = 50
+
+# Enhanced yt-dlp options for fast audio downloads (run in-process, no interpreter per URL),
+# built once at import; each downloader only adds its folders and hooks
+YDL_BASE_OPTS = {
+    'format': 'bestaudio/best',
+    'postprocessors': [{
+        'key': 'FFmpegExtractAudio',
+        'preferredcodec': 'mp3',
+        'preferredquality': '192',
+    }],
+    'noplaylist': True,
+    'no_warnings': True,
+    'ignoreerrors': True,
+    'nocheckcertificate': True,
+    'prefer_insecure': True,
+    'concurrent_fragment_downloads': 4,  # Faster fragment downloads
+    # Retry stalled requests in place rather than restarting below a minimum rate
+    'retries': 10,
+    'fragment_retries': 10,
+    'socket_timeout': 30,
+    # Read and write audio in fixed 1 MiB blocks instead of ramping up from 1 KiB
+    'buffersize': 1 << 20,
+    'noresizebuffer': True,
+    # Enhanced YouTube extractor arguments for speed
+    'extractor_args': {'youtube': {
+        'player_client': ['android'],
+        'player_skip': ['webpage'],
+        'include_hls_manifest': ['false'],
+    }},
+    'http_headers': {'User-Agent': 'Mozilla/5.0 (Linux; Android 13; SM-G991B) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/119.0.0.0 Mobile Safari/537.36'},
+    # Simple output template, relative to the folders in 'paths'
+    'outtmpl': '%(title)s.%(ext)s',
+    'quiet': True,
+    'noprogress': True,
+}
+
+def default_max_workers(url_count):
+    """Parallel downloads to use for a batch: scale with the CPU (2..8), never more than there are URLs"""
+    return max(1, min(url_count, 8, max(2, os.cpu_count() or 2)))
+
+def create_unique_file(folder, stem, ext):
+    """Atomically create folder/stem.ext (or stem_1.ext, stem_2.ext, ...) and return (fd, path)"""
+    path = folder / f"{stem}.{ext}"
+    for counter in itertools.count(1):
+        try:
+            # O_EXCL makes the kernel reject a taken name, so parallel workers never pick the same one
+            return os.open(str(path), os.O_CREAT | os.O_EXCL | os.O_WRONLY | getattr(os, 'O_BINARY', 0), 0o644), path
+        except FileExistsError:
+            path = folder / f"{stem}_{counter}.{ext}"
+
+class MetadataCache:
+    """Memory + SQLite cache of video titles, keyed by video ID"""
+    def __init__(self, db_path=METADATA_CACHE_PATH):
+        self.lock = threading.Lock()
+        self.titles = {}
+        try:
+            Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+            self.db = sqlite3.connect(str(db_path), check_same_thread=False)
+            self.db.execute('CREATE TABLE IF NOT EXISTS titles (id TEXT PRIMARY KEY, title TEXT)')
+            self.db.commit()
+        except sqlite3.Error as e:
+            print(f"⚠️ Metadata cache unavailable, using memory only: {e}")
+            self.db = None
+    
+    def get_title(self, video_id):
+        with self.lock:
+            if video_id in self.titles:
+                return self.titles[video_id]
+            if self.db is None:
+                return None
+            row = self.db.execute('SELECT title FROM titles WHERE id = ?', (video_id,)).fetchone()
+            if row:
+                self.titles[video_id] = row[0]
+                return row[0]
+            return None
+    
+    def set_title(self, video_id, title):
+        with self.lock:
+            self.titles[video_id] = title
+            if self.db is not None:
+                self.db.execute('INSERT OR REPLACE INTO titles (id, title) VALUES (?, ?)', (video_id, title))
+                self.db.commit()
+
+class YDLCaptureLogger:
+    """yt-dlp logger that records the outcome of one download instead of printing it"""
+    def __init__(self):
+        self.reset()
+    
+    def reset(self):
+        """Clear the recorded outcome before the next download"""
+        self.already_downloaded = False
+        self.errors = []
+    
+    def debug(self, msg):
+        if 'has already been downloaded' in msg:
+            self.already_downloaded = True
+    
+    def info(self, msg):
+        pass
+    
+    def warning(self, msg):
+        pass
+    
+    def error(self, msg):
+        self.errors.append(msg)
+
 class FastYTAudioDownloader:
     def __init__(self, output_folder, thumbnail_folder=None):
         self.output_folder = Path(output_folder)
@@ -35,239 +156,213 @@ class FastYTAudioDownloader:
         self.failed_urls = []
         self.lock = threading.Lock()
         
-        # Enhanced yt-dlp options for fast audio downloads
-        self.yt_dlp_options = [
-            sys.executable, '-m', 'yt_dlp',
-            '--extract-audio',
-            '--audio-format', 'mp3',
-            '--audio-quality', '192K',
-            '--no-playlist',
-            '--no-warnings',
-            '--ignore-errors',
-            '--no-check-certificate',
-            '--prefer-insecure',
-            '--concurrent-fragments', '4',  # Faster fragment downloads
-            '--throttled-rate', '100K',      # Minimum download rate
-            # Enhanced YouTube extractor arguments for speed
-            '--extractor-args', 'youtube:player_client=android;player_skip=webpage;include_hls_manifest=false',
-            '--user-agent', 'Mozilla/5.0 (Linux; Android 13; SM-G991B) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/119.0.0.0 Mobile Safari/537.36',
-            # Simple output template
-            '-o', str(self.output_folder / '%(title)s.%(ext)s')
-        ]
+        # One pooled session for the YouTube API (keep-alive, no repeat TLS handshakes)
+        self.session = requests.Session()
+        self.session.mount('https://', HTTPAdapter(
+            pool_connections=4,
+            pool_maxsize=20,
+            max_retries=Retry(total=2, backoff_factor=0.3)
+        ))
+        self.session.headers['User-Agent'] = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/119.0.0.0 Safari/537.36'
+        
+        self.ydl_opts = {
+            **YDL_BASE_OPTS,
+            # Own copy, so appending the thumbnail convertor never touches the shared base
+            'postprocessors': list(YDL_BASE_OPTS['postprocessors']),
+            'paths': {'home': str(self.output_folder)},
+            # Called with each final (post-processed) file path, so only this batch's files get renamed
+            'post_hooks': [self._record_new_file],
+        }
+        self._new_files = []
+        
+        # Let yt-dlp fetch the thumbnail alongside the audio (same session, no extra image probes) and save it as PNG
+        if self.thumbnail_folder:
+            self.ydl_opts['writethumbnail'] = True
+            self.ydl_opts['postprocessors'].append({'key': 'FFmpegThumbnailsConvertor', 'format': 'png', 'when': 'before_dl'})
+            self.ydl_opts['paths']['thumbnail'] = str(self.thumbnail_folder)
+        
+        # YouTube Data API settings, read once instead of on every title lookup
+        self.api_key = os.getenv('YOUTUBE_API_KEY')
+        self.api_url = 'https://www.googleapis.com/youtube/v3/videos'
+        self.api_params = {
+            'key': self.api_key,
+            'part': 'snippet',
+            'fields': 'items(snippet(title))'
+        }
+        
+        self.metadata_cache = MetadataCache()
+        
+        # One YoutubeDL per worker thread, reused for every URL that thread handles
+        self._thread_state = threading.local()
+        self._ydl_instances = []
+    
+    def _get_ydl(self):
+        """Return this thread's (YoutubeDL, logger) pair, creating it on first use"""
+        state = self._thread_state
+        if not hasattr(state, 'ydl'):
+            state.logger = YDLCaptureLogger()
+            state.ydl = yt_dlp.YoutubeDL({**self.ydl_opts, 'logger': state.logger})
+            with self.lock:
+                self._ydl_instances.append(state.ydl)
+        return state.ydl, state.logger
+    
+    def _record_new_file(self, filepath):
+        """yt-dlp post hook: remember a file this run produced"""
+        with self.lock:
+            self._new_files.append(filepath)
+    
+    def _close_ydl_instances(self):
+        """Close the per-thread YoutubeDL instances once a batch is finished"""
+        with self.lock:
+            instances, self._ydl_instances = self._ydl_instances, []
+        for ydl in instances:
+            ydl.close()
+        self._thread_state = threading.local()
     
     def clean_filename_simple(self, filename):
         """Remove special characters from filename"""
-        import re
-        # Remove special characters, keep only letters, numbers, spaces, dots, hyphens, underscores
-        cleaned = re.sub(r'[^a-zA-Z0-9\s._-]', '', filename)
-        # Replace multiple spaces with single space
-        cleaned = re.sub(r'\s+', ' ', cleaned).strip()
-        return cleaned
+        # Remove special characters, keep only letters, numbers, spaces, dots, hyphens, underscores,
+        # then replace multiple spaces with single space
+        return _MULTISPACE_RE.sub(' ', _SPECIAL_CHARS_RE.sub('', filename)).strip()
     
     def extract_video_id(self, url):
         """Extract video ID from YouTube URL"""
-        video_id_pattern = r'(?:youtube\.com/watch\?v=|youtu\.be/)([a-zA-Z0-9_-]{11})'
-        match = re.search(video_id_pattern, url)
+        match = _VIDEO_ID_RE.search(url)
         return match.group(1) if match else None
     
     def get_video_title_api(self, video_id):
-        """Get video title using YouTube API (fastest method)"""
-        api_key = os.getenv('YOUTUBE_API_KEY')
-        if not api_key:
+        """Get video title using YouTube API (fastest method), cached per video ID"""
+        cached = self.metadata_cache.get_title(video_id)
+        if cached:
+            return cached
+        
+        if not self.api_key:
             return None
             
         try:
-            api_url = f'https://www.googleapis.com/youtube/v3/videos'
-            params = {
-                'id': video_id,
-                'key': api_key,
-                'part': 'snippet',
-                'fields': 'items(snippet(title))'
-            }
-            
-            response = requests.get(api_url, params=params, timeout=5)
+            params = {**self.api_params, 'id': video_id}
+            response = self.session.get(self.api_url, params=params, timeout=5)
             if response.status_code == 200:
                 data = response.json()
                 if data.get('items'):
-                    title = data['items'][0]['snippet']['title']
-                    return self.clean_filename_simple(title)
+                    title = self.clean_filename_simple(data['items'][0]['snippet']['title'])
+                    self.metadata_cache.set_title(video_id, title)
+                    return title
             return None
         except Exception as e:
             print(f"   ⚠️ API title extraction failed: {str(e)[:30]}...")
             return None
     
-    def download_thumbnail_permanent(self, url, video_title, video_id):
-        """Download thumbnail permanently as PNG"""
-        if not self.thumbnail_folder:
-            return False
-            
-        try:
-            clean_title = self.clean_filename_simple(video_title) if video_title != "Unknown" else f"video_{video_id}"
-            if not clean_title:
-                clean_title = f"video_{video_id}"
-                
-            # Try different thumbnail qualities
-            thumbnail_urls = [
-                f"https://i.ytimg.com/vi/{video_id}/maxresdefault.jpg",
-                f"https://i.ytimg.com/vi/{video_id}/hqdefault.jpg", 
-                f"https://i.ytimg.com/vi/{video_id}/mqdefault.jpg",
-                f"https://i.ytimg.com/vi/{video_id}/default.jpg"
-            ]
-            
-            for thumb_url in thumbnail_urls:
-                try:
-                    response = requests.get(thumb_url, timeout=10)
-                    if response.status_code == 200 and len(response.content) > 1000:
-                        # Save as PNG with clean filename
-                        filename = f"{clean_title}.png"
-                        filepath = self.thumbnail_folder / filename
-                        
-                        # Avoid duplicates
-                        counter = 1
-                        while filepath.exists():
-                            filename = f"{clean_title}_{counter}.png"
-                            filepath = self.thumbnail_folder / filename
-                            counter += 1
-                        
-                        with open(filepath, 'wb') as f:
-                            f.write(response.content)
-                        
-                        print(f"   🖼️  Thumbnail saved: {filename}")
-                        return True
-                except:
+    def get_video_titles_api_batch(self, video_ids):
+        """Get titles for many videos with one YouTube API call per 50 IDs, cached per video ID"""
+        titles = {}
+        missing = []
+        for video_id in video_ids:
+            cached = self.metadata_cache.get_title(video_id)
+            if cached:
+                titles[video_id] = cached
+            else:
+                missing.append(video_id)
+        
+        if not missing or not self.api_key:
+            return titles
+        
+        for start in range(0, len(missing), API_BATCH_SIZE):
+            batch = missing[start:start + API_BATCH_SIZE]
+            try:
+                params = {**self.api_params, 'id': ','.join(batch), 'fields': 'items(id,snippet(title))'}
+                response = self.session.get(self.api_url, params=params, timeout=5)
+                if response.status_code != 200:
                     continue
-                    
-            print(f"   ⚠️ All thumbnail URLs failed")
-            return False
-            
-        except Exception as e:
-            print(f"   ⚠️ Thumbnail download error: {str(e)[:30]}...")
-            return False
+                for item in response.json().get('items', []):
+                    title = self.clean_filename_simple(item['snippet']['title'])
+                    self.metadata_cache.set_title(item['id'], title)
+                    titles[item['id']] = title
+            except Exception as e:
+                print(f"   ⚠️ API batch title extraction failed: {str(e)[:30]}...")
+        return titles
     
-    def download_thumbnail_fast(self, url, video_title):
-        """Fast background thumbnail download"""
-        def _download_thumb():
-            try:
-                clean_title = self.clean_filename_simple(video_title)
-                if not clean_title:
-                    clean_title = "thumbnail"
-                
-                # Faster thumbnail command
-                thumbnail_cmd = [
-                    sys.executable, '-m', 'yt_dlp',
-                    '--write-thumbnail',
-                    '--skip-download',
-                    '--no-warnings',
-                    '--ignore-errors',
-                    '--extractor-args', 'youtube:player_client=android',  # Faster client
-                    '-o', str(self.thumbnail_folder / f'{clean_title}.%(ext)s'),
-                    url
-                ]
-                
-                result = subprocess.run(
-                    thumbnail_cmd,
-                    capture_output=True,
-                    text=True,
-                    timeout=15  # Reduced timeout for speed
-                )
-                
-                if result.returncode == 0:
-                    thumbnail_files = list(self.thumbnail_folder.glob(f'{clean_title}.*'))
-                    if thumbnail_files:
-                        print(f"   🖼️  Thumbnail saved: {thumbnail_files[0].name}")
-                        return
-                print(f"   ⚠️ Thumbnail download failed")
-            except:
-                print(f"   ⚠️ Thumbnail timeout/error")
-        
-        # Run thumbnail download in background thread
-        import threading
-        thumb_thread = threading.Thread(target=_download_thumb)
-        thumb_thread.daemon = True
-        thumb_thread.start()
+    def prefetch_metadata(self, urls):
+        """Resolve every URL's video ID and title up front with one batched title call"""
+        video_ids = {url: self.extract_video_id(url) for url in urls}
+        unique_ids = [video_id for video_id in dict.fromkeys(video_ids.values()) if video_id]
+        titles = self.get_video_titles_api_batch(unique_ids)
+        return {url: (video_id, titles.get(video_id)) for url, video_id in video_ids.items()}
     
     def rename_downloaded_files(self):
-        """Rename any files with special characters"""
-        for file_path in self.output_folder.glob('*.mp3'):
-            original_name = file_path.name
-            clean_name = self.clean_filename_simple(original_name)
-            
-            if original_name != clean_name:
-                new_path = file_path.parent / clean_name
-                # Avoid conflicts
-                counter = 1
-                while new_path.exists():
-                    name_part = clean_name.rsplit('.', 1)[0]
-                    ext_part = clean_name.rsplit('.', 1)[1]
-                    new_path = file_path.parent / f"{name_part}_{counter}.{ext_part}"
-                    counter += 1
-                
-                try:
-                    file_path.rename(new_path)
-                    print(f"🔧 Renamed: {original_name} → {new_path.name}")
-                except Exception as e:
-                    print(f"⚠️ Could not rename {original_name}: {e}")
-        """Rename any files with special characters"""
-        for file_path in self.output_folder.glob('*.mp3'):
+        """Rename any files from this batch with special characters"""
+        with self.lock:
+            new_files, self._new_files = self._new_files, []
+        
+        # Only what yt-dlp produced this batch, not every mp3 already in the library
+        targets = []
+        for name in dict.fromkeys(os.path.basename(path) for path in new_files):
+            if name.endswith('.mp3'):
+                targets.append(self.output_folder / name)
+                # The PNG yt-dlp wrote next to it carries the same raw title
+                if self.thumbnail_folder:
+                    thumb_path = self.thumbnail_folder / f"{name[:-4]}.png"
+                    if thumb_path.exists():
+                        targets.append(thumb_path)
+        
+        for file_path in targets:
             original_name = file_path.name
+            # Most names are already clean; one search is cheaper than cleaning every name
+            if not _NEEDS_CLEANING_RE.search(original_name):
+                continue
             clean_name = self.clean_filename_simple(original_name)
             
             if original_name != clean_name:
-                new_path = file_path.parent / clean_name
-                # Avoid conflicts
-                counter = 1
-                while new_path.exists():
-                    name_part = clean_name.rsplit('.', 1)[0]
-                    ext_part = clean_name.rsplit('.', 1)[1]
-                    new_path = file_path.parent / f"{name_part}_{counter}.{ext_part}"
-                    counter += 1
-                
                 try:
-                    file_path.rename(new_path)
+                    # Claim a free name first, then move the file over the empty placeholder
+                    name_part, ext_part = clean_name.rsplit('.', 1)
+                    fd, new_path = create_unique_file(file_path.parent, name_part, ext_part)
+                    os.close(fd)
+                    try:
+                        os.replace(file_path, new_path)
+                    except OSError:
+                        new_path.unlink(missing_ok=True)
+                        raise
                     print(f"🔧 Renamed: {original_name} → {new_path.name}")
                 except Exception as e:
                     print(f"⚠️ Could not rename {original_name}: {e}")
     
-    def download_single_audio(self, url, index=None):
+    def download_single_audio(self, url, index=None, metadata=None):
         """Download audio from a single YouTube URL and its thumbnail"""
         try:
             prefix = f"[{index}]" if index else ""
             print(f"🎵 {prefix} Starting download: {url}")
             
-            # Extract video ID and get title using API (fastest method)
-            video_id = self.extract_video_id(url)
+            # Use the (video_id, title) pair from prefetch_metadata() when given, else look it up now
+            if metadata:
+                video_id, api_title = metadata
+            else:
+                video_id = self.extract_video_id(url)
+                api_title = self.get_video_title_api(video_id) if video_id else None
             video_title = "Unknown"
             
             if video_id:
-                # Fast API title extraction
-                api_title = self.get_video_title_api(video_id)
                 if api_title:
                     video_title = api_title
                     print(f"   🏷️  Title: {video_title[:60]}..." if len(video_title) > 60 else f"   🏷️  Title: {video_title}")
-                    
-                    # Download thumbnail immediately using direct URLs
-                    if self.thumbnail_folder:
-                        print(f"   🖼️  Downloading thumbnail...")
-                        # Run in background thread for speed
-                        def _download_thumb():
-                            self.download_thumbnail_permanent(url, video_title, video_id)
-                        
-                        import threading
-                        thumb_thread = threading.Thread(target=_download_thumb)
-                        thumb_thread.daemon = True
-                        thumb_thread.start()
+            
+            # The cleaned mp3 (and its PNG, when thumbnails are wanted) from an earlier run
+            # is already on disk, nothing to fetch
+            if (api_title and (self.output_folder / f"{api_title}.mp3").exists()
+                    and (not self.thumbnail_folder or (self.thumbnail_folder / f"{api_title}.png").exists())):
+                with self.lock:
+                    self.download_count += 1
+                    self.success_count += 1
+                    print(f"✅ {prefix} SUCCESS! File already existed")
+                return
             
             # Start audio download immediately
-            cmd = self.yt_dlp_options + [url]
+            ydl, logger = self._get_ydl()
+            logger.reset()
             start_time = time.time()
             
-            # Run audio download
-            result = subprocess.run(
-                cmd, 
-                capture_output=True, 
-                text=True, 
-                timeout=300  # 5 minute timeout per video
-            )
+            # Run audio download (errors are ignored by yt-dlp but still reach the logger)
+            ydl.download([url])
             
             end_time = time.time()
             duration = end_time - start_time
@@ -275,34 +370,30 @@ class FastYTAudioDownloader:
             with self.lock:
                 self.download_count += 1
                 
-                if result.returncode == 0:
+                if not logger.errors:
                     self.success_count += 1
                     print(f"✅ {prefix} SUCCESS! Downloaded in {duration:.1f}s")
                     
-                    if "has already been downloaded" in result.stdout:
+                    if logger.already_downloaded:
                         print(f"   📁 File already existed")
                     else:
                         print(f"   📁 Saved to: {self.output_folder}")
                 else:
                     self.failed_urls.append(url)
                     print(f"❌ {prefix} FAILED: {url}")
-                    if result.stderr:
-                        print(f"   Error: {result.stderr.strip()[:100]}...")
+                    if logger.errors:
+                        print(f"   Error: {logger.errors[-1].strip()[:100]}...")
                         
-        except subprocess.TimeoutExpired:
-            with self.lock:
-                self.download_count += 1
-                self.failed_urls.append(url)
-            print(f"⏰ {prefix} TIMEOUT: {url} (took too long)")
-            
         except Exception as e:
             with self.lock:
                 self.download_count += 1
                 self.failed_urls.append(url)
             print(f"💥 {prefix} ERROR: {url} - {str(e)}")
     
-    def download_multiple_parallel(self, urls, max_workers=3):
+    def download_multiple_parallel(self, urls, max_workers=None):
         """Download multiple URLs in parallel"""
+        if max_workers is None:
+            max_workers = default_max_workers(len(urls))
         print(f"🚀 Starting parallel download of {len(urls)} videos...")
         print(f"📁 Output folder: {self.output_folder}")
         print(f"🔧 Max parallel downloads: {max_workers}")
@@ -310,14 +401,18 @@ class FastYTAudioDownloader:
         
         start_time = time.time()
         
+        # Title lookups are pure network waits; get them all before the downloads start
+        metadata = self.prefetch_metadata(urls)
+        
         with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
             futures = []
             for i, url in enumerate(urls, 1):
-                future = executor.submit(self.download_single_audio, url, i)
+                future = executor.submit(self.download_single_audio, url, i, metadata[url])
                 futures.append(future)
             
             # Wait for all downloads to complete
             concurrent.futures.wait(futures)
+            self._close_ydl_instances()
                     
             # Clean filenames after downloads
             print("\n🔧 Cleaning filenames (removing special characters)...")
@@ -340,8 +435,19 @@ class FastYTAudioDownloader:
             for url in self.failed_urls:
                 print(f"   {url}")
         
+        # Release pooled sockets; the session reconnects on demand if another batch runs
+        self.session.close()
+        
         return self.success_count, len(self.failed_urls)
 
+def ask(question):
+    """input() that gives the default (empty) answer once the pasted stdin has hit EOF"""
+    try:
+        return input(question).strip().lower()
+    except EOFError:
+        print()
+        return ''
+
 def main():
     """Main function for terminal-based downloader"""
     
@@ -358,58 +464,44 @@ def main():
     print("⚡ Parallel downloads for maximum speed")
     print()
     
-    # Check if yt-dlp is available
-    try:
-        result = subprocess.run([sys.executable, '-m', 'yt_dlp', '--version'], 
-                              capture_output=True, text=True, timeout=10)
-        if result.returncode == 0:
-            print(f"✅ yt-dlp version: {result.stdout.strip()}")
-        else:
-            print("❌ yt-dlp not available! Please install: pip install yt-dlp")
-            return
-    except Exception as e:
-        print(f"❌ Error checking yt-dlp: {e}")
-        return
+    # yt-dlp is imported in-process, so read its version instead of spawning an interpreter
+    print(f"✅ yt-dlp version: {yt_dlp.version.__version__}")
     
     print()
     
     downloader = FastYTAudioDownloader(output_folder, thumbnail_folder)
     
     while True:
-        print("📝 Enter YouTube URLs (paste up to 10 URLs, one per line)")
-        print("   Press Enter twice when done, or type 'quit' to exit")
+        print("📝 Paste YouTube URLs (up to 10 URLs, one per line)")
+        print("   Press Ctrl-D (Ctrl-Z then Enter on Windows) when done, or type 'quit' to exit")
         print("   Example: https://youtu.be/dQw4w9WgXcQ")
         print("-" * 40)
         
-        urls = []
-        empty_count = 0
+        # Read the whole paste in one go instead of one input() round-trip per URL
+        try:
+            raw = sys.stdin.read()
+        except KeyboardInterrupt:
+            print("\n👋 Goodbye!")
+            return
+        candidates = [line.strip() for line in raw.splitlines() if line.strip()]
         
-        while len(urls) < 10:
-            try:
-                url = input(f"URL {len(urls)+1}: ").strip()
-                
-                if url.lower() in ['quit', 'exit', 'q']:
-                    print("👋 Goodbye!")
-                    return
-                
-                if not url:
-                    empty_count += 1
-                    if empty_count >= 2 or len(urls) > 0:
-                        break
-                    continue
-                
-                empty_count = 0
-                
-                # Basic URL validation
-                if 'youtube.com' in url or 'youtu.be' in url:
-                    urls.append(url)
-                    print(f"   ✅ Added ({len(urls)}/10)")
-                else:
-                    print("   ❌ Please enter a valid YouTube URL")
-                    
-            except KeyboardInterrupt:
-                print("\n👋 Goodbye!")
-                return
+        # Nothing at all before EOF (or closed stdin) ends the session like 'quit'
+        if not raw or (candidates and candidates[0].lower() in ['quit', 'exit', 'q']):
+            print("👋 Goodbye!")
+            return
+        
+        # Basic URL validation
+        urls = []
+        for url in candidates:
+            if 'youtube.com' in url or 'youtu.be' in url:
+                urls.append(url)
+            else:
+                print(f"   ❌ Not a valid YouTube URL, skipped: {url}")
+        if len(urls) > 10:
+            print(f"   ⚠️ Only the first 10 of {len(urls)} URLs will be downloaded")
+            urls = urls[:10]
+        if urls:
+            print(f"   ✅ Added {len(urls)}/10")
         
         if not urls:
             print("❌ No URLs provided!")
@@ -419,12 +511,12 @@ def main():
         
         # Ask for parallel download preference
         try:
-            parallel = input("💨 Use parallel downloads for speed? (Y/n): ").strip().lower()
+            parallel = ask("💨 Use parallel downloads for speed? (Y/n): ")
             if parallel in ['n', 'no']:
                 max_workers = 1
                 print("🐌 Using sequential downloads")
             else:
-                max_workers = min(3, len(urls))  # Max 3 parallel
+                max_workers = default_max_workers(len(urls))
                 print(f"⚡ Using {max_workers} parallel downloads")
         except KeyboardInterrupt:
             print("\n👋 Goodbye!")
@@ -441,7 +533,7 @@ def main():
                 print(f"🎵 Check your music folder: {output_folder}")
             
             if failed > 0:
-                retry = input(f"\n🔄 Retry {failed} failed downloads? (y/N): ").strip().lower()
+                retry = ask(f"\n🔄 Retry {failed} failed downloads? (y/N): ")
                 if retry in ['y', 'yes']:
                     print("🔄 Retrying failed downloads...")
                     failed_downloader = FastYTAudioDownloader(output_folder, thumbnail_folder)
@@ -456,7 +548,7 @@ def main():
         downloader.failed_urls = []
         
         print("\n" + "=" * 60)
-        continue_download = input("🔄 Download another batch? (Y/n): ").strip().lower()
+        continue_download = ask("🔄 Download another batch? (Y/n): ")
         if continue_download in ['n', 'no']:
             print("👋 Happy listening! 🎵")
             break
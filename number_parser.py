@@ -3,9 +3,19 @@ Number Parser Utility
 Parses and extracts numbers from various formats to prevent bypass attempts
 """
 
+import operator
 import re
 from word2number import w2n
 
+# Pattern: number operator number (e.g., "5+5", "10 + 10", "5 plus 5"), each paired
+# with the operation it stands for. Text is lowercased before matching.
+_MATH_PATTERNS = [(re.compile(p), op) for p, op in (
+    (r'(\d+)\s*(?:\+|plus)\s*(\d+)', operator.add),
+    (r'(\d+)\s*(?:-|minus)\s*(\d+)', operator.sub),
+    (r'(\d+)\s*(?:\*|×|x|times)\s*(\d+)', operator.mul),
+)]
+_NUM_RE = re.compile(r'\d+')
+
 def extract_number_from_text(text):
     """
     Extract and calculate numbers from text, handling:
@@ -21,28 +31,10 @@ def extract_number_from_text(text):
         text = text.lower().strip()
         
         # Check for math expressions with operators
-        # Pattern: number operator number (e.g., "5+5", "10 + 10", "5 plus 5")
-        math_patterns = [
-            r'(\d+)\s*[\+plus]\s*(\d+)',
-            r'(\d+)\s*[\-minus]\s*(\d+)',
-            r'(\d+)\s*[\*×xXtimes]\s*(\d+)',
-        ]
-        
-        for pattern in math_patterns:
-            match = re.search(pattern, text)
+        for pattern, op in _MATH_PATTERNS:
+            match = pattern.search(text)
             if match:
-                num1 = int(match.group(1))
-                num2 = int(match.group(2))
-                
-                if '+' in text or 'plus' in text:
-                    result = num1 + num2
-                elif '-' in text or 'minus' in text:
-                    result = num1 - num2
-                elif any(op in text for op in ['*', '×', 'x', 'X', 'times']):
-                    result = num1 * num2
-                else:
-                    result = num1
-                
+                result = op(int(match.group(1)), int(match.group(2)))
                 return min(result, 250)
         
         # Try to extract text numbers (e.g., "twenty", "fifty")
@@ -55,7 +47,7 @@ def extract_number_from_text(text):
             pass
         
         # Extract simple numbers
-        numbers = re.findall(r'\d+', text)
+        numbers = _NUM_RE.findall(text)
         if numbers:
             # Sum all numbers found (handles cases like "5 and 5")
             total = sum(int(n) for n in numbers)
@@ -7,6 +7,7 @@ Instantly download thumbnails from YouTube URLs
 import os
 import re
 import requests
+from requests.adapters import HTTPAdapter
 from pathlib import Path
 from dotenv import load_dotenv
 import concurrent.futures
@@ -15,6 +16,21 @@ import threading
 # Load environment variables
 load_dotenv()
 
+_VIDEO_ID_RE = re.compile(r'(?:youtube\.com/watch\?v=|youtu\.be/)([a-zA-Z0-9_-]{11})')
+_CLEAN_RE1 = re.compile(r'[^a-zA-Z0-9\s._-]')
+_CLEAN_RE2 = re.compile(r'\s+')
+
+# Titles already fetched from the API, keyed by (video_id, api_key). Shared by all
+# downloader instances; only successful lookups are stored, so failures get retried.
+_TITLE_CACHE = {}
+
+# Thumbnail qualities, best first
+THUMBNAIL_QUALITIES = ['maxres', 'hq', 'mq', 'default']
+
+# Shared pool for the HEAD probes; kept separate from download_multiple's workers
+# so a worker waiting on its probes can never starve them
+_PROBE_EXECUTOR = concurrent.futures.ThreadPoolExecutor(max_workers=8, thread_name_prefix='thumb-probe')
+
 class QuickThumbnailDownloader:
     def __init__(self, thumbnail_folder):
         self.thumbnail_folder = Path(thumbnail_folder)
@@ -22,17 +38,32 @@ class QuickThumbnailDownloader:
         self.success_count = 0
         self.failed_count = 0
         self.lock = threading.Lock()
+        
+        # One keep-alive session shared by all workers, so only the first request
+        # to i.ytimg.com / googleapis.com pays the TCP + TLS handshake
+        self.session = requests.Session()
+        self.session.mount("https://", HTTPAdapter(pool_connections=2, pool_maxsize=10))
+        self.session.headers['User-Agent'] = 'Mozilla/5.0 (QuickThumbnailDownloader)'
+    
+    def close(self):
+        """Close pooled HTTP connections"""
+        self.session.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc):
+        self.close()
     
     def clean_filename(self, filename):
         """Remove special characters from filename"""
-        cleaned = re.sub(r'[^a-zA-Z0-9\s._-]', '', filename)
-        cleaned = re.sub(r'\s+', ' ', cleaned).strip()
+        cleaned = _CLEAN_RE1.sub('', filename)
+        cleaned = _CLEAN_RE2.sub(' ', cleaned).strip()
         return cleaned
     
     def extract_video_id(self, url):
         """Extract video ID from YouTube URL"""
-        video_id_pattern = r'(?:youtube\.com/watch\?v=|youtu\.be/)([a-zA-Z0-9_-]{11})'
-        match = re.search(video_id_pattern, url)
+        match = _VIDEO_ID_RE.search(url)
         return match.group(1) if match else None
     
     def get_video_title_api(self, video_id):
@@ -40,6 +71,10 @@ class QuickThumbnailDownloader:
         api_key = os.getenv('YOUTUBE_API_KEY')
         if not api_key:
             return f"video_{video_id}"
+        
+        cached = _TITLE_CACHE.get((video_id, api_key))
+        if cached is not None:
+            return cached
             
         try:
             api_url = f'https://www.googleapis.com/youtube/v3/videos'
@@ -50,16 +85,28 @@ class QuickThumbnailDownloader:
                 'fields': 'items(snippet(title))'
             }
             
-            response = requests.get(api_url, params=params, timeout=5)
+            response = self.session.get(api_url, params=params, timeout=5)
             if response.status_code == 200:
                 data = response.json()
                 if data.get('items'):
-                    title = data['items'][0]['snippet']['title']
-                    return self.clean_filename(title)
+                    title = self.clean_filename(data['items'][0]['snippet']['title'])
+                    _TITLE_CACHE[(video_id, api_key)] = title
+                    return title
             return f"video_{video_id}"
         except:
             return f"video_{video_id}"
     
+    def probe_thumbnail(self, thumb_url):
+        """Check with a HEAD request whether a thumbnail exists and isn't a placeholder"""
+        try:
+            response = self.session.head(thumb_url, timeout=5)
+            if response.status_code != 200:
+                return False
+            length = response.headers.get('Content-Length')
+            return length is None or int(length) > 1000
+        except:
+            return False
+    
     def download_thumbnail(self, url, index):
         """Download thumbnail for a single video"""
         try:
@@ -77,18 +124,29 @@ class QuickThumbnailDownloader:
             video_title = self.get_video_title_api(video_id)
             print(f"   🏷️  Title: {video_title[:50]}..." if len(video_title) > 50 else f"   🏷️  Title: {video_title}")
             
-            # Try different thumbnail qualities
+            # Probe every quality at once and only GET the ones that exist
             thumbnail_urls = [
                 f"https://i.ytimg.com/vi/{video_id}/maxresdefault.jpg",
                 f"https://i.ytimg.com/vi/{video_id}/hqdefault.jpg", 
                 f"https://i.ytimg.com/vi/{video_id}/mqdefault.jpg",
                 f"https://i.ytimg.com/vi/{video_id}/default.jpg"
             ]
+            probes = [_PROBE_EXECUTOR.submit(self.probe_thumbnail, thumb_url) for thumb_url in thumbnail_urls]
+            available = [
+                (quality, thumb_url)
+                for quality, thumb_url, probe in zip(THUMBNAIL_QUALITIES, thumbnail_urls, probes)
+                if probe.result()
+            ]
             
-            for quality, thumb_url in zip(['maxres', 'hq', 'mq', 'default'], thumbnail_urls):
+            for quality, thumb_url in available:
+                filepath = None
                 try:
-                    response = requests.get(thumb_url, timeout=10)
-                    if response.status_code == 200 and len(response.content) > 1000:
+                    # Stream straight to disk instead of buffering the whole JPEG in memory
+                    with self.session.get(thumb_url, timeout=10, stream=True) as response:
+                        length = response.headers.get('Content-Length')
+                        if response.status_code != 200 or (length is not None and int(length) <= 1000):
+                            continue
+                        
                         # Save as PNG with clean filename
                         filename = f"{video_title}.png"
                         filepath = self.thumbnail_folder / filename
@@ -100,14 +158,24 @@ class QuickThumbnailDownloader:
                             filepath = self.thumbnail_folder / filename
                             counter += 1
                         
+                        written = 0
                         with open(filepath, 'wb') as f:
-                            f.write(response.content)
-                        
-                        print(f"   ✅ [{index}] Saved: {filename} ({quality} quality)")
-                        with self.lock:
-                            self.success_count += 1
-                        return
+                            for chunk in response.iter_content(chunk_size=64 * 1024):
+                                f.write(chunk)
+                                written += len(chunk)
+                    
+                    if written <= 1000:
+                        filepath.unlink(missing_ok=True)
+                        continue
+                    
+                    print(f"   ✅ [{index}] Saved: {filename} ({quality} quality)")
+                    with self.lock:
+                        self.success_count += 1
+                    return
                 except:
+                    # Don't leave a half-written file behind
+                    if filepath is not None:
+                        filepath.unlink(missing_ok=True)
                     continue
                     
             print(f"   ❌ [{index}] All thumbnail URLs failed")
@@ -160,8 +228,8 @@ def main():
     print("=" * 60 + "🖼️")
     print()
     
-    downloader = QuickThumbnailDownloader(thumbnail_folder)
-    success, failed = downloader.download_multiple(urls)
+    with QuickThumbnailDownloader(thumbnail_folder) as downloader:
+        success, failed = downloader.download_multiple(urls)
     
     if success > 0:
         print(f"\n🎉 {success} thumbnails downloaded successfully!")
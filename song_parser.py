@@ -7,6 +7,15 @@ import re
 from typing import List, Dict
 
 
+# Compiled once at import; the per-line loop below only does the match itself
+# Patterns 1 + 2 in one pass: "1. Song Name by Artist Name" (primary format the AI is
+# instructed to use) or "Song Name by Artist Name" (without number). The optional
+# "num" group tells them apart, so each line costs a single match.
+_SONG_BY_ARTIST = re.compile(
+    r'^(?P<num>\s*\d+\.)?\s*(?P<song>.+?)\s+by\s+(?P<artist>.+?)(?:\s*[-–—]\s*.*)?$'
+)
+
+
 def parse_songs_from_ai_response(text: str) -> List[Dict[str, str]]:
     """
     Parse songs from AI response text
@@ -19,51 +28,21 @@ def parse_songs_from_ai_response(text: str) -> List[Dict[str, str]]:
     """
     songs = []
     
-    # Pattern 1: "1. Song Name by Artist Name"
-    # This is the primary format the AI is instructed to use
-    pattern1 = r'^\s*\d+\.\s*(.+?)\s+by\s+(.+?)(?:\s*[-–—]\s*.*)?$'
-    
-    # Pattern 2: "Song Name by Artist Name" (without number)
-    pattern2 = r'^(.+?)\s+by\s+(.+?)(?:\s*[-–—]\s*.*)?$'
-    
-    # Pattern 3: "1. Song Name - Artist Name"
-    pattern3 = r'^\s*\d+\.\s*(.+?)\s*[-–—]\s*(.+?)(?:\s*[-–—]\s*.*)?$'
-    
-    lines = text.split('\n')
-    
-    for line in lines:
+    for line in text.splitlines():
         line = line.strip()
         if not line:
             continue
         
-        # Try pattern 1 first (numbered "by" format - primary)
-        match = re.match(pattern1, line)
-        if match:
-            song_name = match.group(1).strip()
-            artist_name = match.group(2).strip()
-            
-            # Remove any trailing description after hyphen
-            if ' - ' in artist_name:
-                artist_name = artist_name.split(' - ')[0].strip()
-            
-            songs.append({
-                'song': song_name,
-                'artist': artist_name,
-                'full_query': f"{song_name} by {artist_name}"
-            })
-            continue
-        
-        # Try pattern 2 (unnumbered "by" format)
-        match = re.match(pattern2, line)
+        match = _SONG_BY_ARTIST.match(line)
         if match:
-            song_name = match.group(1).strip()
-            artist_name = match.group(2).strip()
+            song_name = match.group('song').strip()
+            artist_name = match.group('artist').strip()
             
-            # Skip if this looks like a sentence rather than a song
-            if len(song_name.split()) > 8:
+            # Unnumbered lines: skip if this looks like a sentence rather than a song
+            if match.group('num') is None and len(song_name.split()) > 8:
                 continue
             
-            # Remove any trailing description
+            # Remove any trailing description after hyphen
             if ' - ' in artist_name:
                 artist_name = artist_name.split(' - ')[0].strip()
             
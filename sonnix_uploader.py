@@ -4,7 +4,14 @@ Uploads songs to Sonnix website (Firebase) after successful Supabase upload
 """
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import json
+import os
+import secrets
+import string
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
 from mutagen.mp3 import MP3
@@ -19,6 +26,29 @@ FIREBASE_CONFIG = {
     "baseUrl": "https://firestore.googleapis.com/v1/projects/music-x-dfd87/databases/(default)/documents"
 }
 
+# Firestore REST endpoints: single new song document, and multi-document batchWrite
+SONGS_URL = f"{FIREBASE_CONFIG['baseUrl']}/songs?key={FIREBASE_CONFIG['apiKey']}"
+BATCH_WRITE_URL = f"{FIREBASE_CONFIG['baseUrl']}:batchWrite?key={FIREBASE_CONFIG['apiKey']}"
+SONG_DOC_PREFIX = f"projects/{FIREBASE_CONFIG['projectId']}/databases/(default)/documents/songs/"
+
+# Songs per batchWrite request (Firestore allows up to 500 writes per call)
+BATCH_WRITE_SIZE = 100
+
+_DOC_ID_CHARS = string.ascii_letters + string.digits
+
+# Pooled keep-alive session, so each song in a batch skips the TCP + TLS handshake.
+# Retry keeps urllib3's default allowed_methods, so a POST is only re-sent when the
+# connection itself failed and can't create a duplicate document.
+_SESSION = requests.Session()
+_SESSION.headers['Content-Type'] = 'application/json'
+_SESSION.mount("https://", HTTPAdapter(
+    pool_maxsize=16,
+    max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=[429, 500, 502, 503, 504])
+))
+
+# Worker threads for metadata reads and single-upload fallback (below the session's pool_maxsize)
+UPLOAD_WORKERS = 8
+
 
 def extract_artist_and_song_from_filename(filename: str) -> dict:
     """
@@ -58,6 +88,60 @@ def extract_artist_and_song_from_filename(filename: str) -> dict:
     }
 
 
+# MPEG audio Layer III bitrates in kbps, indexed by the frame header's bitrate bits
+_MP3_BITRATES_V1 = (0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320, 0)
+_MP3_BITRATES_V2 = (0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160, 0)
+
+
+def _fast_mp3_duration(file_path: str):
+    """
+    Estimate a CBR MP3's duration from its first frame header and the file size
+    
+    Reads only the ID3v2 header, the first frame and the ID3v1 tag area instead of
+    letting mutagen scan the stream.
+    
+    Returns:
+        Duration in seconds (float), or None if the file isn't a plain CBR Layer III
+        stream (VBR, free bitrate, junk before the first frame...)
+    """
+    with open(file_path, 'rb') as f:
+        head = f.read(10)
+        audio_start = 0
+        if head[:3] == b'ID3' and len(head) == 10:
+            # Synchsafe size excludes the 10-byte header (and the footer, if flagged)
+            tag_size = (head[6] << 21) | (head[7] << 14) | (head[8] << 7) | head[9]
+            audio_start = 10 + tag_size + (10 if head[5] & 0x10 else 0)
+        
+        f.seek(audio_start)
+        frame = f.read(64)
+        if len(frame) < 40 or frame[0] != 0xFF or (frame[1] & 0xE0) != 0xE0:
+            return None
+        
+        version = (frame[1] >> 3) & 0x03  # 3 = MPEG1, 2 = MPEG2, 0 = MPEG2.5
+        layer = (frame[1] >> 1) & 0x03    # 1 = Layer III
+        if version == 1 or layer != 1 or ((frame[2] >> 2) & 0x03) == 3:
+            return None
+        
+        bitrates = _MP3_BITRATES_V1 if version == 3 else _MP3_BITRATES_V2
+        bitrate = bitrates[frame[2] >> 4] * 1000
+        if not bitrate:
+            return None
+        
+        # A Xing or VBRI header means variable bitrate; "Info" is the CBR variant
+        mono = (frame[3] >> 6) == 3
+        side_info = (17 if mono else 32) if version == 3 else (9 if mono else 17)
+        if frame[4 + side_info:8 + side_info] == b'Xing' or frame[36:40] == b'VBRI':
+            return None
+        
+        size = os.fstat(f.fileno()).st_size
+        if size >= audio_start + 128:
+            f.seek(-128, os.SEEK_END)
+            if f.read(3) == b'TAG':
+                size -= 128
+    
+    return (size - audio_start) * 8 / bitrate
+
+
 def get_audio_duration(file_path: str) -> int:
     """
     Get duration of MP3 file in seconds
@@ -69,13 +153,47 @@ def get_audio_duration(file_path: str) -> int:
         Duration in seconds (integer)
     """
     try:
-        audio = MP3(file_path)
-        return int(audio.info.length)
+        # CBR fast path (yt-dlp's MP3s); mutagen handles everything else
+        duration = _fast_mp3_duration(file_path)
+        if duration is None:
+            duration = MP3(file_path).info.length
+        return int(duration)
     except Exception as e:
         print(f"⚠️ Could not read duration for {file_path}: {e}")
         return 180  # Default 3 minutes
 
 
+def build_song_fields(song_data: dict) -> dict:
+    """
+    Build the Firestore "fields" map for a Sonnix song document
+    
+    Args:
+        song_data: Dict with keys: title, artist, duration, audioUrl
+        
+    Returns:
+        Firestore typed field dict
+    """
+    # One clock read per document, so createdAt/updatedAt/customId all agree
+    now = datetime.now()
+    now_stamp = now.strftime('%Y-%m-%dT%H:%M:%S.%fZ')
+    slug = song_data['title'][:10].replace(' ', '_')
+    return {
+        "title": {"stringValue": song_data['title']},
+        "artist": {"stringValue": song_data['artist']},
+        "duration": {"integerValue": str(song_data['duration'])},
+        "audioUrl": {"stringValue": song_data['audioUrl']},
+        "album": {"stringValue": song_data.get('album', '')},
+        "genre": {"stringValue": song_data.get('genre', 'Unknown')},
+        "releaseDate": {"stringValue": song_data.get('releaseDate', now.strftime('%Y-%m-%d'))},
+        "imageUrl": {"stringValue": song_data.get('imageUrl', '/default-song.png')},
+        "plays": {"integerValue": "0"},
+        "isLiked": {"booleanValue": False},
+        "createdAt": {"timestampValue": now_stamp},
+        "updatedAt": {"timestampValue": now_stamp},
+        "customId": {"stringValue": f"song_{int(now.timestamp())}_{slug}"}
+    }
+
+
 def upload_song_to_sonnix(song_data: dict) -> dict:
     """
     Upload a single song to Sonnix Firebase
@@ -88,34 +206,10 @@ def upload_song_to_sonnix(song_data: dict) -> dict:
     """
     try:
         # Prepare Firebase document structure
-        firebase_document = {
-            "fields": {
-                "title": {"stringValue": song_data['title']},
-                "artist": {"stringValue": song_data['artist']},
-                "duration": {"integerValue": str(song_data['duration'])},
-                "audioUrl": {"stringValue": song_data['audioUrl']},
-                "album": {"stringValue": song_data.get('album', '')},
-                "genre": {"stringValue": song_data.get('genre', 'Unknown')},
-                "releaseDate": {"stringValue": song_data.get('releaseDate', datetime.now().strftime('%Y-%m-%d'))},
-                "imageUrl": {"stringValue": song_data.get('imageUrl', '/default-song.png')},
-                "plays": {"integerValue": "0"},
-                "isLiked": {"booleanValue": False},
-                "createdAt": {"timestampValue": datetime.now().strftime('%Y-%m-%dT%H:%M:%S.%fZ')},
-                "updatedAt": {"timestampValue": datetime.now().strftime('%Y-%m-%dT%H:%M:%S.%fZ')},
-                "customId": {"stringValue": f"song_{int(datetime.now().timestamp())}_{song_data['title'][:10].replace(' ', '_')}"}
-            }
-        }
-        
-        # Firebase REST API endpoint
-        url = f"{FIREBASE_CONFIG['baseUrl']}/songs?key={FIREBASE_CONFIG['apiKey']}"
+        firebase_document = {"fields": build_song_fields(song_data)}
         
         # Make POST request
-        response = requests.post(
-            url,
-            headers={'Content-Type': 'application/json'},
-            json=firebase_document,
-            timeout=30
-        )
+        response = _SESSION.post(SONGS_URL, json=firebase_document, timeout=30)
         
         if response.status_code in [200, 201]:
             firebase_id = response.json().get('name', '').split('/')[-1]
@@ -141,6 +235,62 @@ def upload_song_to_sonnix(song_data: dict) -> dict:
         }
 
 
+def upload_songs_batched(song_data_list: list):
+    """
+    Upload several songs to Sonnix Firebase in one batchWrite request
+    
+    Document ids are generated client-side (same 20-character form Firestore uses)
+    and each write carries an exists=false precondition, so nothing is overwritten.
+    
+    Args:
+        song_data_list: List of song_data dicts (see upload_song_to_sonnix)
+        
+    Returns:
+        A {'success', 'message', 'firebase_id'} dict per song in input order,
+        or None if Firestore rejected the batch request as a whole
+    """
+    doc_ids = [''.join(secrets.choice(_DOC_ID_CHARS) for _ in range(20)) for _ in song_data_list]
+    body = {
+        "writes": [
+            {
+                "update": {"name": SONG_DOC_PREFIX + doc_id, "fields": build_song_fields(song_data)},
+                "currentDocument": {"exists": False}
+            }
+            for doc_id, song_data in zip(doc_ids, song_data_list)
+        ]
+    }
+    
+    try:
+        response = _SESSION.post(BATCH_WRITE_URL, json=body, timeout=60)
+        if response.status_code != 200:
+            print(f"❌ Sonnix batch upload failed: HTTP {response.status_code}")
+            print(f"Response: {response.text[:200]}")
+            return None
+        statuses = response.json().get('status', [])
+    except Exception as e:
+        # The writes may still have landed (e.g. read timeout), so don't re-send them
+        print(f"❌ Sonnix batch upload error: {str(e)}")
+        return [{'success': False, 'message': str(e)} for _ in song_data_list]
+    
+    results = []
+    for i, (doc_id, song_data) in enumerate(zip(doc_ids, song_data_list)):
+        # google.rpc.Status; an omitted code means OK
+        status = statuses[i] if i < len(statuses) else {}
+        if status.get('code', 0) == 0:
+            print(f"✅ Uploaded to Sonnix: \"{song_data['title']}\" by {song_data['artist']}")
+            results.append({
+                'success': True,
+                'message': 'Uploaded to Sonnix successfully',
+                'firebase_id': doc_id
+            })
+        else:
+            results.append({
+                'success': False,
+                'message': f"Firestore {status.get('code')}: {status.get('message', '')[:100]}"
+            })
+    return results
+
+
 def upload_batch_to_sonnix(audio_files: list, public_urls: list, progress_callback=None) -> dict:
     """
     Upload multiple audio files to Sonnix after Supabase upload
@@ -153,10 +303,14 @@ def upload_batch_to_sonnix(audio_files: list, public_urls: list, progress_callba
     Returns:
         {'successful': int, 'failed': int, 'details': list}
     """
+    log_lock = threading.Lock()
+    
     def log(message):
-        print(message)
-        if progress_callback:
-            progress_callback(message)
+        # Workers log concurrently; keep lines and callback calls from interleaving
+        with log_lock:
+            print(message)
+            if progress_callback:
+                progress_callback(message)
     
     log("🎸 Uploading to Sonnix...")
     
@@ -168,10 +322,13 @@ def upload_batch_to_sonnix(audio_files: list, public_urls: list, progress_callba
     
     # Create a mapping of filename to Supabase URL
     url_map = {filename: url for filename, url in public_urls}
+    total = len(audio_files)
     
-    log(f"🎵 Uploading {len(audio_files)} songs to Sonnix Firebase...")
+    log(f"🎵 Uploading {total} songs to Sonnix Firebase...")
     
-    for i, audio_file in enumerate(audio_files, 1):
+    def prepare_one(item):
+        """Read metadata and duration for one file; returns (song_data, details entry)"""
+        i, audio_file = item
         try:
             file_path = Path(audio_file)
             filename = file_path.name
@@ -179,13 +336,11 @@ def upload_batch_to_sonnix(audio_files: list, public_urls: list, progress_callba
             # Check if we have a Supabase URL for this file
             if filename not in url_map:
                 log(f"⚠️ Skipping {filename}: No Supabase URL found")
-                results['failed'] += 1
-                results['details'].append({
+                return None, {
                     'filename': filename,
                     'success': False,
                     'error': 'No Supabase URL'
-                })
-                continue
+                }
             
             supabase_url = url_map[filename]
             
@@ -206,38 +361,58 @@ def upload_batch_to_sonnix(audio_files: list, public_urls: list, progress_callba
                 'imageUrl': '/default-song.png'
             }
             
-            # Upload to Sonnix
-            log(f"📤 [{i}/{len(audio_files)}] {metadata['song']} by {metadata['artist']}")
-            result = upload_song_to_sonnix(song_data)
-            
-            if result['success']:
-                results['successful'] += 1
-                log(f"✅ [{i}/{len(audio_files)}] Success")
-            else:
-                results['failed'] += 1
-                log(f"❌ [{i}/{len(audio_files)}] Failed")
-            
-            results['details'].append({
+            log(f"📤 [{i}/{total}] {metadata['song']} by {metadata['artist']}")
+            return song_data, {
                 'filename': filename,
                 'song': metadata['song'],
                 'artist': metadata['artist'],
                 'duration': duration,
-                'supabase_url': supabase_url,
-                'success': result['success'],
-                'message': result.get('message', ''),
-                'firebase_id': result.get('firebase_id', '')
-            })
+                'supabase_url': supabase_url
+            }
             
         except Exception as e:
             log(f"❌ Error processing {audio_file}: {str(e)}")
-            results['failed'] += 1
-            results['details'].append({
+            return None, {
                 'filename': Path(audio_file).name,
                 'success': False,
                 'error': str(e)
-            })
+            }
+    
+    if audio_files:
+        with ThreadPoolExecutor(max_workers=min(UPLOAD_WORKERS, total), thread_name_prefix='sonnix') as executor:
+            # Read every file's metadata concurrently; map() keeps details in input order
+            pending = []
+            for i, (song_data, detail) in enumerate(executor.map(prepare_one, enumerate(audio_files, 1)), 1):
+                results['details'].append(detail)
+                if song_data is None:
+                    results['failed'] += 1
+                else:
+                    pending.append((i, song_data, detail))
+            
+            # One batchWrite round trip per chunk instead of one POST per song
+            for start in range(0, len(pending), BATCH_WRITE_SIZE):
+                chunk = pending[start:start + BATCH_WRITE_SIZE]
+                songs = [song_data for _, song_data, _ in chunk]
+                outcomes = upload_songs_batched(songs)
+                if outcomes is None:
+                    # Batch endpoint refused the request; fall back to concurrent single uploads
+                    log("⚠️ Batch upload failed, uploading songs individually...")
+                    outcomes = list(executor.map(upload_song_to_sonnix, songs))
+                
+                for (i, _, detail), result in zip(chunk, outcomes):
+                    if result['success']:
+                        results['successful'] += 1
+                        log(f"✅ [{i}/{total}] Success")
+                    else:
+                        results['failed'] += 1
+                        log(f"❌ [{i}/{total}] Failed")
+                    detail.update({
+                        'success': result['success'],
+                        'message': result.get('message', ''),
+                        'firebase_id': result.get('firebase_id', '')
+                    })
     
-    log(f"✅ Sonnix complete: {results['successful']}/{len(audio_files)} uploaded")
+    log(f"✅ Sonnix complete: {results['successful']}/{total} uploaded")
     if results['successful'] > 0:
         log(f"🎉 View at: https://sonnix.netlify.app/all-songs")
     
@@ -50,8 +50,10 @@ def main():
     print()
     print("-" * 60)
     
-    # Start the Flask app
-    os.system(f"{sys.executable} app_web.py")
+    # Start the Flask app in this interpreter; flask/selenium are already imported above
+    from app_web import app
+    port = int(os.environ.get("PORT", 5000))
+    app.run(host="0.0.0.0", port=port, debug=False)
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,16 @@
+-- Atomic SerpAPI usage counter for groq_service.increment_search_counter()
+-- Run once in the Supabase SQL editor of the AI usage project.
+-- One round trip instead of SELECT + UPDATE, and concurrent searches can't lose increments.
+
+create or replace function increment_search_count(max_count integer default 250)
+returns integer
+language sql
+as $$
+    update api_usage
+       set search_count = least(search_count + 1, max_count),
+           updated_at = now()
+     where id = 'main'
+ returning search_count;
+$$;
+
+grant execute on function increment_search_count(integer) to anon;
@@ -4,6 +4,7 @@ Utility functions for uploading files to Supabase Storage
 """
 
 import os
+import concurrent.futures
 from supabase import create_client
 from pathlib import Path
 from typing import Optional
@@ -112,40 +113,46 @@ class SupabaseUploader:
             print(f"❌ Thumbnail upload failed for {file_path}: {str(e)}")
             return ""
 
-    def upload_audio_files_batch(self, file_paths: list, bucket_name: str = "audio-files") -> list:
+    def upload_audio_files_batch(self, file_paths: list, bucket_name: str = "audio-files",
+                                 max_workers: int = 4) -> list:
         """
-        Upload multiple audio files to Supabase Storage
+        Upload multiple audio files to Supabase Storage in parallel
 
         Args:
             file_paths: List of paths to audio files
             bucket_name: Name of the Supabase storage bucket
+            max_workers: Maximum number of concurrent uploads
 
         Returns:
-            list: List of upload responses
+            list: List of upload responses (in the same order as file_paths)
         """
-        results = []
-
         print(f"\n🎵 Uploading {len(file_paths)} audio files to Supabase...")
         print("=" * 60)
 
-        for i, file_path in enumerate(file_paths, 1):
+        def upload_one(indexed_path):
+            i, file_path = indexed_path
             try:
                 print(f"📤 [{i}/{len(file_paths)}] Uploading: {Path(file_path).name}")
 
                 response = self.upload_audio_file(file_path, bucket_name)
-                results.append({
+                return {
                     "file_path": file_path,
                     "success": True,
                     "response": response
-                })
+                }
 
             except Exception as e:
                 print(f"❌ [{i}/{len(file_paths)}] Failed to upload: {Path(file_path).name}")
-                results.append({
+                return {
                     "file_path": file_path,
                     "success": False,
                     "error": str(e)
-                })
+                }
+
+        # Uploads are independent network calls, so run them concurrently
+        workers = max(1, min(max_workers, len(file_paths)))
+        with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(upload_one, enumerate(file_paths, 1)))
 
         # Print summary
         success_count = sum(1 for r in results if r["success"])
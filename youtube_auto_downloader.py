@@ -14,6 +14,9 @@ import requests
 import concurrent.futures
 import threading
 import json
+import glob
+import shutil
+import functools
 from googleapiclient.discovery import build
 from googleapiclient.errors import HttpError
 from bs4 import BeautifulSoup
@@ -21,14 +24,35 @@ from bs4 import BeautifulSoup
 # Import Supabase uploader
 from supabase_uploader import SupabaseUploader
 
+@functools.lru_cache(maxsize=1)
+def find_ffmpeg():
+    """Find the directory containing the ffmpeg executable (looked up once per process)"""
+    # First try shutil which checks PATH
+    ffmpeg_path = shutil.which('ffmpeg')
+    if ffmpeg_path:
+        return os.path.dirname(ffmpeg_path)
+    # Try common locations
+    common_paths = [
+        '/usr/bin',
+        '/usr/local/bin',
+        '/opt/homebrew/bin',
+    ]
+    # Also check nix store
+    nix_paths = glob.glob('/nix/store/*-ffmpeg-*/bin')
+    common_paths.extend(nix_paths)
+    for path in common_paths:
+        if os.path.isfile(os.path.join(path, 'ffmpeg')):
+            return path
+    return None
+
 class YouTubeAutoDownloader:
-    def __init__(self, audio_folder="Audios", enable_supabase=True):
+    def __init__(self, audio_folder="Audios", enable_supabase=True, ffmpeg_location=None):
         self.audio_folder = Path(audio_folder)
         self.audio_folder.mkdir(parents=True, exist_ok=True)
         self.lock = threading.Lock()
         
-        # Find ffmpeg location
-        self.ffmpeg_location = self._find_ffmpeg()
+        # Find ffmpeg location (callers may pass one they already detected)
+        self.ffmpeg_location = ffmpeg_location or find_ffmpeg()
         if self.ffmpeg_location:
             print(f"🎬 Found ffmpeg at: {self.ffmpeg_location}")
         else:
@@ -61,28 +85,6 @@ class YouTubeAutoDownloader:
             print("📝 Downloads will work, but uploads will be skipped")
             self.enable_supabase = False
     
-    def _find_ffmpeg(self):
-        """Find ffmpeg executable in common locations"""
-        import shutil
-        import glob
-        # First try shutil which checks PATH
-        ffmpeg_path = shutil.which('ffmpeg')
-        if ffmpeg_path:
-            return os.path.dirname(ffmpeg_path)
-        # Try common locations
-        common_paths = [
-            '/usr/bin',
-            '/usr/local/bin',
-            '/opt/homebrew/bin',
-        ]
-        # Also check nix store
-        nix_paths = glob.glob('/nix/store/*-ffmpeg-*/bin')
-        common_paths.extend(nix_paths)
-        for path in common_paths:
-            if os.path.isfile(os.path.join(path, 'ffmpeg')):
-                return path
-        return None
-    
     def init_youtube_api(self):
         """Initialize YouTube API client with API key"""
         try: